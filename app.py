@@ -7,26 +7,48 @@ Features file upload, real-time progress tracking, and results download.
 """
 
 import os
-import json
+import asyncio
+import collections
+import gc
+import itertools
+import logging
+import logging.handlers
 import csv
 import uuid
 import time
+import zlib
 from datetime import datetime
 from pathlib import Path
 from threading import Thread
+from urllib.parse import urlsplit
+import aiometer
+import orjson
 from flask import Flask, render_template, request, jsonify, send_file, redirect, url_for, flash
+from flask.json.provider import JSONProvider
 from werkzeug.utils import secure_filename
 from werkzeug.exceptions import RequestEntityTooLarge
-import pandas as pd
 from dotenv import load_dotenv
 
 # Import our scraper classes
-from firecrawl_csv_scraper import FirecrawlCSVScraper, ScrapeResult
+from firecrawl_csv_scraper import FirecrawlCSVScraper, JsonlWriter
+from rate_limiter import RateLimiter
+from job_store import create_job_store
+from job_queue import create_job_queue
 
 # Load environment variables
 load_dotenv()
 
+class OrjsonProvider(JSONProvider):
+    """Serve jsonify() responses with orjson instead of the stdlib encoder"""
+    
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode()
+    
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
 app = Flask(__name__)
+app.json = OrjsonProvider(app)
 app.secret_key = os.getenv('SECRET_KEY', 'dev-secret-key-change-in-production')
 app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16MB max file size
 
@@ -39,150 +61,234 @@ ALLOWED_EXTENSIONS = {'csv', 'txt'}
 os.makedirs(UPLOAD_FOLDER, exist_ok=True)
 os.makedirs(RESULTS_FOLDER, exist_ok=True)
 
-# Global storage for job status (in production, use Redis or database)
-job_status = {}
+# Buffered job logging: per-URL lines are written in blocks rather than one
+# stdio write per line, and warnings flush the buffer immediately
+logger = logging.getLogger('scraper')
+logger.setLevel(os.getenv('LOG_LEVEL', 'INFO').upper())
+logger.propagate = False
+_log_target = logging.StreamHandler()
+_log_target.setFormatter(logging.Formatter('%(asctime)s %(levelname)s %(message)s'))
+log_handler = logging.handlers.MemoryHandler(1024, flushLevel=logging.WARNING, target=_log_target)
+logger.addHandler(log_handler)
+
+# The scraper library logs retries and per-URL errors under its own module logger
+scraper_logger = logging.getLogger('firecrawl_csv_scraper')
+scraper_logger.setLevel(logger.level)
+scraper_logger.propagate = False
+scraper_logger.addHandler(log_handler)
+
+# Job status storage, shared across processes via Redis when REDIS_URL is set
+job_status = create_job_store()
+
+# Persistent job queue consumed by worker.py; jobs run in a local thread without Redis
+job_queue = create_job_queue()
 
 def allowed_file(filename):
     """Check if file extension is allowed"""
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
-def run_scraping_job(job_id, csv_file, url_column, formats, delay, max_retries, api_key, json_prompt=""):
-    """Background task to run the scraping job"""
-    try:
-        # Update job status
-        job_status[job_id]['status'] = 'running'
-        job_status[job_id]['message'] = 'Initializing scraper...'
+def log_result(result, url_time):
+    """Log a summary line for a single scraped URL"""
+    if result.success:
+        logger.info("scrape_success url=%s elapsed=%.1f title=%s", result.url, url_time, result.title)
         
-        # Initialize scraper
-        scraper = FirecrawlCSVScraper(api_key=api_key, delay=delay)
+        # Previews serialize or slice the whole payload, so only build them when DEBUG is on
+        if logger.isEnabledFor(logging.DEBUG):
+            if result.extracted:
+                logger.debug("scrape_extracted url=%s data=%.200s", result.url,
+                             orjson.dumps(result.extracted).decode())
+            elif result.content and result.content.strip():
+                preview = result.content.strip()[:150].replace('\n', ' ')
+                logger.debug("scrape_content url=%s preview=%s", result.url, preview)
+    else:
+        logger.warning("scrape_failed url=%s elapsed=%.1f error=%s", result.url, url_time, result.error)
+    
+    # Log slow URLs
+    if url_time > 30:  # More than 30 seconds
+        logger.info("scrape_slow url=%s elapsed=%.1f", result.url, url_time)
+
+class JobCancelled(Exception):
+    """Raised inside a running job once the user has cancelled it"""
+
+def interleave_by_host(urls):
+    """Reorder URLs round-robin across hosts, keeping each host's own order"""
+    urls_by_host = {}
+    for url in urls:
+        urls_by_host.setdefault(urlsplit(url).netloc.lower(), []).append(url)
+    interleaved = itertools.chain.from_iterable(itertools.zip_longest(*urls_by_host.values()))
+    return [url for url in interleaved if url is not None], len(urls_by_host)
+
+async def scrape_urls_concurrently(job_id, scraper, urls, writer, scrape_params, requests_per_second,
+                                   concurrency, batch_size):
+    """
+    Scrape URLs concurrently, updating job progress as each batch completes.
+    
+    URLs are submitted to Firecrawl's batch endpoint `batch_size` at a time, with
+    up to `concurrency` batches in flight. Every request goes to the Firecrawl API,
+    so a single token bucket caps the whole job at `requests_per_second`. URLs are
+    interleaved across hosts before chunking, so batches mix hosts. When a batch
+    fails as a whole, its URLs are scraped individually and concurrently: at most
+    `concurrency` such requests are in flight across the job, and each host gets
+    at most concurrency // hosts of them, so one slow or rate-limited site cannot
+    take every slot. Failed requests are retried by the scraper's HTTP transport.
+    Each result is passed to `writer` as soon as it arrives and only
+    running counts are kept in memory.
+    
+    Returns (successful, failed) for the URLs recorded before the job finished
+    or was cancelled.
+    """
+    start_time = job_status.get_field(job_id, 'start_time')
+    total = len(urls)
+    successful = failed = 0
+    
+    urls, host_count = interleave_by_host(urls)
+    chunks = [urls[i:i + batch_size] for i in range(0, len(urls), batch_size)]
+    limiter = RateLimiter(requests_per_second=requests_per_second)
+    per_host_concurrency = max(1, concurrency // host_count)
+    host_slots = collections.defaultdict(lambda: asyncio.Semaphore(per_host_concurrency))
+    request_slots = asyncio.Semaphore(concurrency)  # Caps per-URL requests across all chunks
+    
+    # The scraper's pooled client reuses TCP/TLS connections across URLs; it is
+    # bound to this job's event loop, so close it before the loop goes away
+    async with scraper:
         
-        # Read URLs from CSV
-        job_status[job_id]['message'] = 'Reading URLs from CSV...'
-        urls = scraper.read_urls_from_csv(csv_file, url_column)
-        job_status[job_id]['total_urls'] = len(urls)
+        async def scrape_one(url):
+            async with host_slots[urlsplit(url).netloc.lower()], request_slots:
+                return await scraper.scrape_url_async(url, scrape_params, limiter=limiter)
         
-        if not urls:
-            job_status[job_id]['status'] = 'error'
-            job_status[job_id]['message'] = 'No URLs found in CSV file'
-            return
+        async def worker(chunk):
+            if job_status.get_field(job_id, 'status') == 'cancelled':
+                return None
+            
+            if len(chunk) > 1:
+                try:
+                    await limiter.acquire()  # One permit for the batch submission
+                    return await scraper.scrape_batch_async(chunk, scrape_params)
+                except Exception as e:
+                    logger.warning("batch_failed size=%d error=%s fallback=per_url", len(chunk), e)
+            
+            # Per-URL fallback: the chunk's URLs run concurrently, each taking its own
+            # permit from the job's bucket; gather keeps them in chunk order
+            return await asyncio.gather(*(scrape_one(url) for url in chunk))
         
-        job_status[job_id]['message'] = f'Starting to scrape {len(urls)} URLs...'
-        job_status[job_id]['start_time'] = time.time()
+        def record(chunk_results):
+            nonlocal successful, failed
+            
+            # Check if job was cancelled
+            if chunk_results is None or job_status.get_field(job_id, 'status') == 'cancelled':
+                raise JobCancelled()
+            
+            for result in chunk_results:
+                writer.write(result)
+                successful += result.success
+                failed += not result.success
+                log_result(result, result.processing_time or 0)
+            
+            processed = job_status.incr(job_id, 'processed', len(chunk_results))
+            
+            # Calculate ETA
+            elapsed = time.time() - start_time
+            eta_minutes = int((total - processed) * elapsed / processed / 60)
+            job_status.update(job_id, message=f'Scraped {processed}/{total} URLs... (ETA: {eta_minutes}m)')
         
-        # Custom scraping with progress updates
-        results = []
-        total_scrape_time = 0
+        try:
+            async with aiometer.amap(worker, chunks, max_at_once=concurrency) as results:
+                async for chunk_results in results:
+                    record(chunk_results)
+        except JobCancelled:
+            logger.info("job_cancelled job_id=%s", job_id)
+    
+    return successful, failed
+
+def run_scraping_job(job_id, csv_file, url_column, formats, delay, max_retries, api_key=None, json_prompt="",
+                     requests_per_second=None):
+    """Background task to run the scraping job; api_key defaults to FIRECRAWL_API_KEY"""
+    try:
+        # Update job status; a job reclaimed from a dead worker starts over from zero
+        job_status.update(job_id, status='running', message='Initializing scraper...', processed=0)
         
-        for i, url in enumerate(urls, 1):
-            # Check if job was cancelled
-            if job_status[job_id].get('status') == 'cancelled':
-                print(f"🛑 Job {job_id} was cancelled by user")
-                job_status[job_id]['message'] = f'Job cancelled after processing {i-1}/{len(urls)} URLs'
+        # Initialize scraper; from here on it must be closed however the job ends,
+        # or atexit keeps it and its connection pools alive for the life of the process
+        scraper = FirecrawlCSVScraper(api_key=api_key or os.getenv('FIRECRAWL_API_KEY'), delay=delay,
+                                      max_retries=max_retries)
+        # Full results are appended to disk as they arrive and converted to JSON at the end
+        jsonl_file = os.path.join(RESULTS_FOLDER, f'{job_id}_results.jsonl')
+        output_file = os.path.join(RESULTS_FOLDER, f'{job_id}_results.json')
+        try:
+            # Read URLs from CSV
+            job_status.update(job_id, message='Reading URLs from CSV...')
+            urls = scraper.read_urls_from_csv(csv_file, url_column)
+            job_status.update(job_id, total_urls=len(urls))
+            
+            if not urls:
+                job_status.update(job_id, status='error', message='No URLs found in CSV file')
                 return
             
-            job_status[job_id]['processed'] = i
+            start_time = time.time()
+            job_status.update(job_id, message=f'Starting to scrape {len(urls)} URLs...', start_time=start_time)
             
-            # Calculate ETA
-            if i > 1:
-                elapsed = time.time() - job_status[job_id]['start_time']
-                avg_time_per_url = elapsed / (i - 1)
-                remaining_urls = len(urls) - i + 1
-                eta_seconds = remaining_urls * avg_time_per_url
-                eta_minutes = int(eta_seconds / 60)
-                job_status[job_id]['message'] = f'Scraping {i}/{len(urls)}: {url[:50]}... (ETA: {eta_minutes}m)'
-            else:
-                job_status[job_id]['message'] = f'Scraping {i}/{len(urls)}: {url[:50]}...'
+            # Prepare scraping parameters
+            scrape_params = {'formats': formats}
             
-            # Scrape URL with retries
-            url_start_time = time.time()
-            for attempt in range(max_retries + 1):
-                try:
-                    # Prepare scraping parameters
-                    scrape_params = {'formats': formats}
-                    
-                    # Add JSON extraction if requested
-                    if 'json' in formats and json_prompt:
-                        scrape_params['json_options'] = {'prompt': json_prompt}
-                    
-                    result = scraper.scrape_url_advanced(url, scrape_params)
-                    results.append(result)
-                    
-                    # Track timing
-                    url_time = time.time() - url_start_time
-                    total_scrape_time += url_time
-                    
-                    # Show results in console
-                    if result.success:
-                        print(f"✅ SUCCESS ({url_time:.1f}s): {url}")
-                        if result.title:
-                            print(f"   📄 Title: {result.title}")
-                        
-                        # Show extracted JSON data if available
-                        if 'json' in formats and result.content and "---\nExtracted Data:" in result.content:
-                            try:
-                                json_part = result.content.split("---\nExtracted Data:\n")[1]
-                                extracted_data = json.loads(json_part)
-                                print(f"   🤖 Extracted: {json.dumps(extracted_data, indent=4)[:200]}...")
-                            except:
-                                print(f"   🤖 JSON extraction completed")
-                        
-                        # Show content preview for other formats
-                        elif result.content and len(result.content.strip()) > 0:
-                            preview = result.content.strip()[:150].replace('\n', ' ')
-                            print(f"   📝 Content: {preview}...")
-                        
-                        print()  # Empty line for readability
-                    else:
-                        print(f"❌ FAILED ({url_time:.1f}s): {url}")
-                        print(f"   ⚠️  Error: {result.error}")
-                        print()
-                    
-                    # Log slow URLs
-                    if url_time > 30:  # More than 30 seconds
-                        print(f"🐌 SLOW URL ({url_time:.1f}s): {url}")
-                    
-                    break
-                except Exception as e:
-                    if attempt < max_retries:
-                        time.sleep((attempt + 1) * 2)
-                    else:
-                        result = ScrapeResult(
-                            url=url,
-                            success=False,
-                            error=f"Failed after {max_retries} retries: {str(e)}",
-                            scraped_at=datetime.now().isoformat()
-                        )
-                        results.append(result)
+            # Add JSON extraction if requested
+            if 'json' in formats and json_prompt:
+                scrape_params['json_options'] = {'prompt': json_prompt}
+            
+            concurrency = int(os.getenv('SCRAPE_CONCURRENCY', 20))
+            batch_size = max(1, int(os.getenv('SCRAPE_BATCH_SIZE', 100)))
+            
+            # The delay field is kept for backward compatibility: it now sets the request rate
+            if not requests_per_second:
+                requests_per_second = 1.0 / delay if delay > 0 else float(concurrency)
             
-            # Rate limiting delay
-            if i < len(urls):
-                time.sleep(delay)
+            # Truncate first: a reclaimed job must not keep the crashed run's partial records
+            with JsonlWriter(jsonl_file, include_html=True, append=False) as writer:
+                counts = asyncio.run(scrape_urls_concurrently(
+                    job_id, scraper, urls, writer, scrape_params, requests_per_second,
+                    concurrency, batch_size
+                ))
+            scraper.export_jsonl_to_json(jsonl_file, output_file)
+        finally:
+            scraper.close()
+            log_handler.flush()
+            if os.path.exists(jsonl_file):
+                os.remove(jsonl_file)
+            
+            # Release the job's results and HTTP buffers before the next job starts
+            del scraper
+            gc.collect()
+        
+        successful, failed = counts
+        processed = successful + failed
         
-        # Check if job was cancelled before finishing
-        if job_status[job_id].get('status') == 'cancelled':
+        # Check if job was cancelled before finishing; keep the partial results downloadable
+        if job_status.get_field(job_id, 'status') == 'cancelled':
+            job_status.update(
+                job_id,
+                message=f'Job cancelled after processing {processed}/{len(urls)} URLs',
+                results_file=output_file,
+                successful=successful,
+                failed=failed
+            )
             return
-            
-        # Save results
-        scraper.results = results
-        output_file = os.path.join(RESULTS_FOLDER, f'{job_id}_results.json')
-        scraper.export_to_json(output_file, include_html=True)
         
         # Update final status
-        successful = sum(1 for r in results if r.success)
-        total_time = time.time() - job_status[job_id]['start_time']
-        avg_time_per_url = total_time / len(results) if results else 0
+        total_time = time.time() - start_time
+        avg_time_per_url = total_time / processed if processed else 0
         
-        job_status[job_id]['status'] = 'completed'
-        job_status[job_id]['message'] = f'Completed! {successful}/{len(results)} URLs scraped successfully (avg: {avg_time_per_url:.1f}s per URL)'
-        job_status[job_id]['results_file'] = output_file
-        job_status[job_id]['successful'] = successful
-        job_status[job_id]['failed'] = len(results) - successful
-        job_status[job_id]['total_time'] = total_time
-        job_status[job_id]['avg_time_per_url'] = avg_time_per_url
+        job_status.update(
+            job_id,
+            status='completed',
+            message=f'Completed! {successful}/{processed} URLs scraped successfully (avg: {avg_time_per_url:.1f}s per URL)',
+            results_file=output_file,
+            successful=successful,
+            failed=failed,
+            total_time=total_time,
+            avg_time_per_url=avg_time_per_url
+        )
         
     except Exception as e:
-        job_status[job_id]['status'] = 'error'
-        job_status[job_id]['message'] = f'Error: {str(e)}'
+        job_status.update(job_id, status='error', message=f'Error: {str(e)}')
 
 @app.route('/')
 def index():
@@ -234,33 +340,52 @@ def upload_file():
         delay = float(request.form.get('delay', 1.0))
         max_retries = int(request.form.get('max_retries', 3))
         json_prompt = request.form.get('json_prompt', '')
+        requests_per_second = float(request.form.get('requests_per_second') or 0) or None
         
         # Validate CSV and column
         try:
-            df = pd.read_csv(file_path)
-            if url_column not in df.columns:
-                flash(f'Column "{url_column}" not found. Available columns: {", ".join(df.columns)}', 'error')
+            # Only the header row is needed to check the column exists
+            with open(file_path, newline='', encoding='utf-8-sig') as f:
+                header = next(csv.reader(f), [])
+            if url_column not in header:
+                flash(f'Column "{url_column}" not found. Available columns: {", ".join(header)}', 'error')
                 return redirect(url_for('index'))
         except Exception as e:
             flash(f'Error reading CSV file: {str(e)}', 'error')
             return redirect(url_for('index'))
         
         # Initialize job status
-        job_status[job_id] = {
+        job_status.create(job_id, {
             'status': 'queued',
             'message': 'Job queued for processing',
             'total_urls': 0,
             'processed': 0,
             'filename': filename,
             'created_at': datetime.now().isoformat()
+        })
+        
+        job_args = {
+            'job_id': job_id,
+            'csv_file': file_path,
+            'url_column': url_column,
+            'formats': formats,
+            'delay': delay,
+            'max_retries': max_retries,
+            'api_key': api_key,
+            'json_prompt': json_prompt,
+            'requests_per_second': requests_per_second
         }
         
         # Start background scraping job
-        thread = Thread(
-            target=run_scraping_job,
-            args=(job_id, file_path, url_column, formats, delay, max_retries, api_key, json_prompt)
-        )
-        thread.start()
+        if job_queue is not None:
+            # Queued payloads sit in Redis in plain text. Workers read the server's own
+            # key from their environment, so only a key typed into the form is sent.
+            if api_key == os.getenv('FIRECRAWL_API_KEY'):
+                del job_args['api_key']
+            job_queue.push(job_args)
+        else:
+            thread = Thread(target=run_scraping_job, kwargs=job_args)
+            thread.start()
         
         return redirect(url_for('job_status_page', job_id=job_id))
         
@@ -280,7 +405,7 @@ def job_redirect():
 @app.route('/job/<job_id>')
 def job_status_page(job_id):
     """Job status page with real-time updates"""
-    if not job_id or job_id not in job_status:
+    if not job_id or not job_status.exists(job_id):
         flash('Job not found', 'error')
         return redirect(url_for('index'))
     
@@ -289,45 +414,59 @@ def job_status_page(job_id):
 @app.route('/api/job/<job_id>/status')
 def job_status_api(job_id):
     """API endpoint for job status updates"""
-    if not job_id or job_id not in job_status:
+    if not job_id:
         return jsonify({'error': 'Job not found'}), 404
     
-    status = job_status[job_id].copy()
+    # Cheap fingerprint first: most polls see a running job with unchanged progress
+    state, processed, total_urls, message = job_status.get_fields(
+        job_id, 'status', 'processed', 'total_urls', 'message'
+    )
+    if state is None:
+        return jsonify({'error': 'Job not found'}), 404
     
-    # Calculate progress percentage
-    if status.get('total_urls', 0) > 0:
-        status['progress'] = int((status.get('processed', 0) / status['total_urls']) * 100)
+    etag = f"{state}:{processed or 0}:{total_urls or 0}:{zlib.crc32((message or '').encode()):x}"
+    if request.if_none_match.contains(etag):
+        response = app.response_class(status=304)
     else:
-        status['progress'] = 0
+        status = job_status.get(job_id)
+        
+        # Calculate progress percentage
+        if status.get('total_urls', 0) > 0:
+            status['progress'] = int((status.get('processed', 0) / status['total_urls']) * 100)
+        else:
+            status['progress'] = 0
+        
+        response = jsonify(status)
     
-    return jsonify(status)
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'no-cache'  # Always revalidate, never serve stale progress
+    return response
 
 @app.route('/cancel/<job_id>', methods=['POST'])
 def cancel_job(job_id):
     """Cancel a running job"""
-    if not job_id or job_id not in job_status:
+    job = job_status.get(job_id) if job_id else None
+    if job is None:
         return jsonify({'error': 'Job not found'}), 404
     
-    job = job_status[job_id]
     if job['status'] in ['completed', 'error', 'cancelled']:
         return jsonify({'error': 'Job cannot be cancelled'}), 400
     
     # Mark job as cancelled
-    job_status[job_id]['status'] = 'cancelled'
-    job_status[job_id]['message'] = 'Job cancelled by user'
+    job_status.update(job_id, status='cancelled', message='Job cancelled by user')
     
-    print(f"🛑 User cancelled job {job_id}")
+    logger.info("job_cancel_requested job_id=%s", job_id)
     
     return jsonify({'success': True, 'message': 'Job cancelled successfully'})
 
 @app.route('/download/<job_id>')
 def download_results(job_id):
     """Download results file"""
-    if not job_id or job_id not in job_status:
+    job = job_status.get(job_id) if job_id else None
+    if job is None:
         flash('Job not found', 'error')
         return redirect(url_for('index'))
     
-    job = job_status[job_id]
     if job['status'] not in ['completed', 'cancelled'] or 'results_file' not in job:
         flash('Results not available', 'error')
         return redirect(url_for('job_status_page', job_id=job_id))
@@ -342,7 +481,7 @@ def download_results(job_id):
 def list_jobs():
     """API endpoint to list all jobs"""
     jobs = []
-    for job_id, status in job_status.items():
+    for job_id, status in job_status.list_jobs():
         jobs.append({
             'job_id': job_id,
             'status': status['status'],
@@ -10,19 +10,32 @@ Detection heuristics (any one is enough):
 Respects robots.txt, stays on-domain, follows pagination & category links.
 """
 
-import argparse, csv, re, time, sys, urllib.parse as up
-from collections import deque
-from typing import Set, Tuple
+import argparse, asyncio, csv, functools, re, sys, urllib.parse as up
+from typing import Dict, Optional, Set, Tuple
 
-import requests
-from bs4 import BeautifulSoup
+import aiohttp
+import lxml.etree
+import lxml.html
 import tldextract
+import xxhash
 import urllib.robotparser as robotparser
 
-DEFAULT_UA = "Mozilla/5.0 (compatible; url-exporter/1.0; +https://example.local)"
-PRODUCT_JSONLD_RE = re.compile(r'"@type"\s*:\s*"(?:Product|product)"', re.I)
-OG_PRODUCT_RE = re.compile(r'<meta[^>]+property=["\']og:type["\'][^>]+content=["\']product["\']', re.I)
+from rate_limiter import RateLimiter
 
+DEFAULT_UA = "Mozilla/5.0 (compatible; url-exporter/1.0; +https://example.local)"
+PRODUCT_JSONLD_RE = re.compile(rb'"@type"\s*:\s*"(?:Product|product)"', re.I)
+OG_PRODUCT_RE = re.compile(rb'<meta[^>]+property=["\']og:type["\'][^>]+content=["\']product["\']', re.I)
+# hrefs worth following, filtered in C rather than per-tag in Python
+HREF_XPATH = lxml.etree.XPath(
+    "//a/@href[not(starts-with(normalize-space(.), '#'))"
+    " and not(starts-with(normalize-space(.), 'mailto:'))"
+    " and not(starts-with(normalize-space(.), 'tel:'))]"
+)
+CANONICAL_XPATH = lxml.etree.XPath(
+    "//link[contains(concat(' ', translate(@rel, 'CANONICAL', 'canonical'), ' '), ' canonical ')]/@href"
+)
+
+@functools.lru_cache(maxsize=200_000)
 def normalize_url(url: str) -> str:
     u = up.urlsplit(url)
     scheme = u.scheme or "https"
@@ -35,9 +48,16 @@ def normalize_url(url: str) -> str:
     frag = ""
     return up.urlunsplit((scheme, netloc, path, query, frag))
 
+def url_digest(url: str) -> int:
+    # xxhash 4 only hashes bytes
+    return xxhash.xxh64_intdigest(url.encode())
+
+@functools.lru_cache(maxsize=200_000)
+def url_host(url: str) -> str:
+    return up.urlsplit(url).netloc.lower()
+
 def same_site(url: str, allowed_hosts: Set[str]) -> bool:
-    host = up.urlsplit(url).netloc.lower()
-    return host in allowed_hosts
+    return url_host(url) in allowed_hosts
 
 def get_allowed_hosts(start_url: str) -> Set[str]:
     parts = up.urlsplit(start_url)
@@ -51,49 +71,142 @@ def get_allowed_hosts(start_url: str) -> Set[str]:
         variants.add(root_host)
     return variants
 
-def is_product_html(html: str) -> bool:
+def is_product_html(html: bytes) -> bool:
     if not html:
         return False
-    if PRODUCT_JSONLD_RE.search(html):
-        return True
-    if OG_PRODUCT_RE.search(html):
+    # cheapest check first: Magento product pages carry product-info-main, and a
+    # literal `in` is a C memchr-style scan, unlike a case-insensitive alternation
+    if b"product-info-main" in html:
         return True
-    # quick extra check: Magento product page often has product-info-main
-    if 'class="product-info-main"' in html or "product-info-main" in html:
+    if PRODUCT_JSONLD_RE.search(html):
         return True
-    return False
-
-def extract_links(soup: BeautifulSoup, base_url: str) -> Set[str]:
-    links = set()
-    for a in soup.find_all("a", href=True):
-        href = a["href"].strip()
-        if href.startswith("#") or href.startswith("mailto:") or href.startswith("tel:"):
-            continue
-        absu = up.urljoin(base_url, href)
-        links.add(absu)
-    return links
-
-def get_canonical(soup: BeautifulSoup, url: str) -> str:
-    link = soup.find("link", rel=lambda v: v and "canonical" in v.lower())
-    if link and link.get("href"):
+    return OG_PRODUCT_RE.search(html) is not None
+
+def parse_html(html: bytes) -> lxml.html.HtmlElement:
+    # raw bytes let lxml pick up the page's declared charset itself
+    return lxml.html.fromstring(html)
+
+def extract_links(tree: lxml.html.HtmlElement, base_url: str) -> Set[str]:
+    return {up.urljoin(base_url, href.strip()) for href in HREF_XPATH(tree)}
+
+def get_canonical(tree: lxml.html.HtmlElement, url: str) -> str:
+    hrefs = CANONICAL_XPATH(tree)
+    if hrefs and hrefs[0].strip():
         try:
-            return normalize_url(up.urljoin(url, link["href"]))
+            return normalize_url(up.urljoin(url, hrefs[0].strip()))
         except Exception:
             pass
     return normalize_url(url)
 
-def fetch(session: requests.Session, url: str, timeout=20) -> Tuple[int, str]:
-    r = session.get(url, timeout=timeout)
-    ctype = r.headers.get("Content-Type", "")
-    if "text/html" not in ctype and "application/xhtml" not in ctype:
-        return r.status_code, ""
-    return r.status_code, r.text
+async def fetch(session: aiohttp.ClientSession, url: str, timeout=20) -> Tuple[int, bytes]:
+    async with session.get(url, timeout=aiohttp.ClientTimeout(total=timeout)) as r:
+        ctype = r.headers.get("Content-Type", "")
+        if "text/html" not in ctype and "application/xhtml" not in ctype:
+            return r.status, b""
+        # bytes, not text: neither the marker scan nor lxml needs a decoded str
+        return r.status, await r.read()
+
+async def crawl(args, start: str, allowed_hosts: Set[str],
+                rp: robotparser.RobotFileParser) -> Tuple[int, Set[str]]:
+    q: asyncio.Queue = asyncio.Queue()
+    q.put_nowait(start)
+    # seen sets hold 64-bit xxhash digests instead of URL strings (~3x smaller);
+    # a collision is ~3e-8 likely even at 1M URLs
+    seen: Set[int] = set()
+    seen_raw: Set[int] = set()  # absolute links already normalized once
+    product_urls: Set[str] = set()
+    pages_crawled = 0
+
+    # one token bucket per host keeps --delay as the per-host politeness interval
+    limiters: Dict[str, RateLimiter] = {}
+
+    def limiter_for(url: str) -> Optional[RateLimiter]:
+        if args.delay <= 0:
+            return None
+        host = url_host(url)
+        if host not in limiters:
+            limiters[host] = RateLimiter(requests_per_second=1.0 / args.delay)
+        return limiters[host]
+
+    async def process(session: aiohttp.ClientSession, url: str):
+        nonlocal pages_crawled
+        # single event loop, so the shared sets need no locking
+        h = url_digest(url)
+        if h in seen:
+            return
+        seen.add(h)
+
+        if not same_site(url, allowed_hosts):
+            return
+        if rp.default_entry and not rp.can_fetch(args.ua, url):
+            return
+        if pages_crawled >= args.max_pages:
+            return
+
+        # reserve the page slot up front so concurrent workers can't overshoot --max-pages
+        pages_crawled += 1
+        limiter = limiter_for(url)
+        if limiter:
+            await limiter.acquire()
+        try:
+            status, html = await fetch(session, url)
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            pages_crawled -= 1
+            return
+
+        if status != 200 or not html:
+            return
+
+        try:
+            tree = parse_html(html)
+        except lxml.etree.ParserError:
+            return
+
+        # If it's a product page, store canonical and skip queueing further from it (optional)
+        if is_product_html(html):
+            canon = get_canonical(tree, url)
+            if same_site(canon, allowed_hosts):
+                product_urls.add(canon)
+
+        # enqueue internal links (pagination, categories, etc.)
+        for link in extract_links(tree, url):
+            # most links repeat on every page (nav, footer); skip them before any urlsplit
+            h = url_digest(link)
+            if h in seen_raw:
+                continue
+            seen_raw.add(h)
+            n = normalize_url(link)
+            if url_host(n) in allowed_hosts and url_digest(n) not in seen:
+                q.put_nowait(n)
+
+    async def worker(session: aiohttp.ClientSession):
+        while True:
+            url = await q.get()
+            try:
+                await process(session, url)
+            except Exception as e:
+                # a dead worker would leave q.join() waiting forever
+                print(f"Error processing {url}: {e}", file=sys.stderr)
+            finally:
+                q.task_done()
+
+    connector = aiohttp.TCPConnector(limit=args.concurrency)
+    headers = {"User-Agent": args.ua, "Accept": "text/html,application/xhtml+xml"}
+    async with aiohttp.ClientSession(connector=connector, headers=headers) as session:
+        workers = [asyncio.create_task(worker(session)) for _ in range(args.concurrency)]
+        await q.join()
+        for w in workers:
+            w.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+
+    return pages_crawled, product_urls
 
 def main():
     ap = argparse.ArgumentParser()
     ap.add_argument("--start", default="https://www.hardrace.co.uk/", help="Start URL")
     ap.add_argument("--out", default="hardrace_product_urls.csv", help="Output CSV path")
-    ap.add_argument("--delay", type=float, default=1.0, help="Seconds between requests")
+    ap.add_argument("--delay", type=float, default=1.0, help="Seconds between requests to the same host")
+    ap.add_argument("--concurrency", type=int, default=20, help="Concurrent fetch workers")
     ap.add_argument("--max-pages", type=int, default=15000, help="Max pages to crawl")
     ap.add_argument("--ua", default=DEFAULT_UA, help="User-Agent")
     args = ap.parse_args()
@@ -111,51 +224,7 @@ def main():
         # proceed cautiously if robots can’t be fetched
         pass
 
-    s = requests.Session()
-    s.headers.update({"User-Agent": args.ua, "Accept": "text/html,application/xhtml+xml"})
-
-    q = deque([start])
-    seen: Set[str] = set()
-    product_urls: Set[str] = set()
-    pages_crawled = 0
-
-    while q and pages_crawled < args.max_pages:
-        url = q.popleft()
-        if url in seen:
-            continue
-        seen.add(url)
-
-        if not same_site(url, allowed_hosts):
-            continue
-        if rp.default_entry and not rp.can_fetch(args.ua, url):
-            continue
-
-        try:
-            status, html = fetch(s, url)
-        except requests.RequestException:
-            continue
-
-        pages_crawled += 1
-        if status != 200 or not html:
-            time.sleep(args.delay)
-            continue
-
-        soup = BeautifulSoup(html, "html.parser")
-
-        # If it's a product page, store canonical and skip queueing further from it (optional)
-        if is_product_html(html):
-            canon = get_canonical(soup, url)
-            if same_site(canon, allowed_hosts):
-                product_urls.add(canon)
-
-        # enqueue internal links (pagination, categories, etc.)
-        for link in extract_links(soup, url):
-            n = normalize_url(link)
-            if same_site(n, allowed_hosts) and n not in seen:
-                q.append(n)
-
-        # be polite
-        time.sleep(args.delay)
+    pages_crawled, product_urls = asyncio.run(crawl(args, start, allowed_hosts, rp))
 
     # write CSV
     with open(args.out, "w", newline="", encoding="utf-8") as f:
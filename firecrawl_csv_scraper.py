@@ -18,28 +18,164 @@ Usage:
 """
 
 import argparse
+import asyncio
+import atexit
 import csv
-import json
+import gc
+import itertools
+import logging
+import logging.handlers
+import operator
 import os
+import queue
+import re
+import signal
 import sys
+import threading
 import time
-from dataclasses import dataclass, asdict
-from datetime import datetime
+from collections import deque
+from dataclasses import dataclass, field, fields
+from datetime import datetime, timezone
 from pathlib import Path
-from typing import List, Dict, Any, Optional
-import pandas as pd
+from typing import List, Dict, Any, Generator, Iterable, Iterator, Optional
+import httpx
+import orjson
+import zstandard
 from dotenv import load_dotenv
+from tqdm import tqdm
+
+from rate_limiter import RateLimiter
+from resume_cache import ResumeCache
+from retry_transport import AsyncRetryTransport, RetryTransport
 
 try:
-    from firecrawl import FirecrawlApp
+    # Optional: multithreaded C++ CSV tokenizer for large input files
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    from pyarrow import csv as pacsv
 except ImportError:
-    print("Error: firecrawl-py not installed. Run: pip install firecrawl-py")
-    sys.exit(1)
+    pacsv = None
 
 # Load environment variables
 load_dotenv()
 
-@dataclass
+FIRECRAWL_API_URL = os.getenv('FIRECRAWL_API_URL', 'https://api.firecrawl.dev')
+BATCH_TIMEOUT = 900  # Seconds to wait for a batch scrape job before giving up on it
+PIPELINE_QUEUE_SIZE = 1000  # Bound on URLs waiting for a worker and results waiting for the writer
+
+logger = logging.getLogger(__name__)
+
+# Cheap syntactic check so malformed rows never cost an API call
+_URL_RE = re.compile(r'^https?://[^\s/?#]+[^\s]*$', re.IGNORECASE)
+
+class _TqdmHandler(logging.StreamHandler):
+    """Write log lines above any active progress bar instead of through it"""
+    
+    def emit(self, record):
+        try:
+            tqdm.write(self.format(record), file=self.stream)
+        except Exception:
+            self.handleError(record)
+
+def setup_logging(level: str = 'INFO') -> logging.handlers.QueueListener:
+    """
+    Send this module's log records to stderr through a queue
+    
+    Scraping code only enqueues records; a background listener thread does the
+    formatting and terminal I/O, so concurrent workers never contend for stderr.
+    
+    Args:
+        level: Logging level name
+        
+    Returns:
+        The started QueueListener; call stop() on it to flush remaining records
+    """
+    log_queue = queue.SimpleQueue()
+    handler = _TqdmHandler(sys.stderr)
+    handler.setFormatter(logging.Formatter('%(message)s'))
+    
+    logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    logger.setLevel(level.upper())
+    logger.propagate = False
+    
+    listener = logging.handlers.QueueListener(log_queue, handler)
+    listener.start()
+    return listener
+
+# zstd contexts are not safe to share between threads (web app jobs run in
+# several), so each thread lazily creates its own pair
+_zstd = threading.local()
+
+def _compress_text(text: str) -> bytes:
+    """zstd-compress a string for compact in-memory storage"""
+    cctx = getattr(_zstd, 'cctx', None)
+    if cctx is None:
+        cctx = _zstd.cctx = zstandard.ZstdCompressor(level=3)
+    return cctx.compress(text.encode('utf-8'))
+
+def _decompress_text(data: bytes) -> str:
+    """Inverse of _compress_text"""
+    dctx = getattr(_zstd, 'dctx', None)
+    if dctx is None:
+        dctx = _zstd.dctx = zstandard.ZstdDecompressor()
+    return dctx.decompress(data).decode('utf-8')
+
+def utc_timestamp() -> str:
+    """Current UTC time as a second-resolution ISO 8601 string, used for scraped_at"""
+    return datetime.now(timezone.utc).isoformat(timespec='seconds')
+
+def _to_camel(key: str) -> str:
+    """Convert SDK-style snake_case parameter names to the REST API's camelCase"""
+    head, *tail = key.split('_')
+    return head + ''.join(part.title() for part in tail)
+
+def _iter_column_csv(rows: Iterable[Dict[str, str]], column: str) -> Iterator[str]:
+    """Yield the stripped, non-empty values of one column from csv.DictReader rows"""
+    return (value for value in ((row[column] or '').strip() for row in rows) if value)
+
+def _iter_column_arrow(csv_file: str, column: str) -> Iterator[str]:
+    """
+    Yield the stripped, non-empty values of one CSV column using pyarrow
+    
+    Only `column` is converted, always as strings, one record batch at a time.
+    Files pyarrow refuses but the csv module accepts (rows with the wrong
+    number of cells, or a header with no rows and no trailing newline) are
+    finished with csv.DictReader instead, skipping the values already
+    yielded, so the output is always the same as the csv module's.
+    
+    Args:
+        csv_file: Path to CSV file
+        column: Name of the column to read; must be in the header
+    """
+    yielded = 0
+    try:
+        reader = pacsv.open_csv(
+            csv_file,
+            read_options=pacsv.ReadOptions(use_threads=True),
+            # Other columns may hold free text with quoted newlines
+            parse_options=pacsv.ParseOptions(newlines_in_values=True),
+            convert_options=pacsv.ConvertOptions(
+                include_columns=[column],
+                column_types={column: pa.string()},
+                strings_can_be_null=True
+            )
+        )
+        for batch in reader:
+            values = pc.utf8_trim_whitespace(batch.column(0).drop_null())
+            for value in values.to_pylist():
+                if value:
+                    yielded += 1
+                    yield value
+        return
+    except pa.ArrowInvalid as e:
+        # Batches come out in file order and stop at the first bad row, so
+        # everything yielded so far is what the csv module would have read first
+        logger.debug("pyarrow could not read %s (%s), continuing with the csv module", csv_file, e)
+    
+    with open(csv_file, newline='', encoding='utf-8-sig') as f:
+        yield from itertools.islice(_iter_column_csv(csv.DictReader(f), column), yielded, None)
+
+@dataclass(slots=True)
 class ScrapeResult:
     """Data class for storing scrape results"""
     url: str
@@ -47,27 +183,452 @@ class ScrapeResult:
     status_code: Optional[int] = None
     title: Optional[str] = None
     content: Optional[str] = None
-    html: Optional[str] = None
+    extracted: Optional[Dict[str, Any]] = None  # Structured output of JSON extraction
+    html_text: Optional[str] = field(default=None, repr=False)  # Read either through .html
+    html_zst: Optional[bytes] = field(default=None, repr=False)  # Set by compress_html()
     error: Optional[str] = None
     scraped_at: Optional[str] = None
     processing_time: Optional[float] = None
+    
+    @property
+    def html(self) -> Optional[str]:
+        """Page HTML, decompressed on access if compress_html() was called"""
+        if self.html_zst is not None:
+            return _decompress_text(self.html_zst)
+        return self.html_text
+    
+    @html.setter
+    def html(self, html: Optional[str]):
+        self.html_text = html
+        self.html_zst = None
+    
+    def compress_html(self):
+        """Keep the HTML zstd-compressed until it is read, for results held in memory"""
+        if self.html_text:
+            self.html_zst = _compress_text(self.html_text)
+            self.html_text = None
+
+# Field accessors are built once; attrgetter pulls every field in a single C call,
+# avoiding asdict()'s recursive deep copy and per-field getattr() lookups.
+# HTML is exported once, as plain text, through the html property.
+_FIELDNAMES = tuple('html' if f.name == 'html_text' else f.name
+                    for f in fields(ScrapeResult) if f.name != 'html_zst')
+_get_fields = operator.attrgetter(*_FIELDNAMES)
+_FIELDNAMES_NO_HTML = tuple(name for name in _FIELDNAMES if name != 'html')
+_get_fields_no_html = operator.attrgetter(*_FIELDNAMES_NO_HTML)
+_CSV_FIELDNAMES = ('url', 'success', 'status_code', 'title', 'error', 'scraped_at', 'processing_time')
+_get_csv_fields = operator.attrgetter(*_CSV_FIELDNAMES)
+
+def serialize_result(result: ScrapeResult, include_html: bool = False) -> bytes:
+    """Serialize a ScrapeResult to compact JSON bytes"""
+    if include_html:
+        return orjson.dumps(dict(zip(_FIELDNAMES, _get_fields(result))))
+    # Leave out HTML to reduce file size
+    return orjson.dumps(dict(zip(_FIELDNAMES_NO_HTML, _get_fields_no_html(result))))
+
+# Output files get a 1 MiB buffer so records reach the OS in large writes
+# instead of one syscall per record or field
+WRITE_BUFFER_SIZE = 1 << 20
+
+class JsonArrayWriter:
+    """Write ScrapeResults to a JSON array file one at a time as they arrive"""
+    
+    def __init__(self, output_file: str, include_html: bool = False, collect_every: int = 100):
+        """
+        Open the output file and start the JSON array
+        
+        Args:
+            output_file: Path to the JSON file to write
+            include_html: Whether to keep the HTML field in each record
+            collect_every: Collect garbage after this many records
+        """
+        self.include_html = include_html
+        self.collect_every = collect_every
+        self.count = 0
+        self.file = open(output_file, 'wb', buffering=WRITE_BUFFER_SIZE)
+        self.file.write(b'[')
+    
+    def write(self, result: ScrapeResult):
+        """Append a single result to the array"""
+        self.write_record(serialize_result(result, self.include_html))
+    
+    def write_record(self, record: bytes):
+        """Append an already-serialized JSON record to the array"""
+        # Separator goes before each record, so the file never needs a trailing comma stripped
+        self.file.write(b',\n' if self.count else b'\n')
+        self.file.write(record)
+        self.count += 1
+        
+        if self.count % self.collect_every == 0:
+            gc.collect()
+    
+    def flush(self):
+        """Push buffered records to the OS"""
+        self.file.flush()
+    
+    def close(self):
+        """Terminate the JSON array and close the file"""
+        if not self.file.closed:
+            self.file.write(b'\n]\n')
+            self.file.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+class JsonlWriter:
+    """Append ScrapeResults to a JSON Lines file, one record per line"""
+    
+    def __init__(self, output_file: str, include_html: bool = False, collect_every: int = 100,
+                 append: bool = True):
+        """
+        Open the output file for appending
+        
+        Args:
+            output_file: Path to the JSONL file to write
+            include_html: Whether to keep the HTML field in each record
+            collect_every: Collect garbage after this many records
+            append: Keep existing lines instead of truncating the file
+        """
+        self.include_html = include_html
+        self.collect_every = collect_every
+        self.count = 0
+        self.file = open(output_file, 'ab' if append else 'wb', buffering=WRITE_BUFFER_SIZE)
+    
+    def write(self, result: ScrapeResult):
+        """Append a single result as one line"""
+        # Two buffered writes avoid copying the whole record just to add the newline
+        self.file.write(serialize_result(result, self.include_html))
+        self.file.write(b'\n')
+        self.count += 1
+        
+        if self.count % self.collect_every == 0:
+            gc.collect()
+    
+    def flush(self):
+        """Push buffered records to the OS"""
+        self.file.flush()
+    
+    def close(self):
+        """Close the file"""
+        self.file.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+class CsvWriter:
+    """Write ScrapeResult summary rows to a CSV file as they arrive"""
+    
+    def __init__(self, output_file: str, append: bool = False):
+        """
+        Open the output file and write the header row
+        
+        Args:
+            output_file: Path to the CSV file to write
+            append: Add rows to an existing file instead of truncating it; the
+                header is only written if the file is empty
+        """
+        self.count = 0
+        self.file = open(output_file, 'a' if append else 'w', newline='', encoding='utf-8',
+                         buffering=WRITE_BUFFER_SIZE)
+        self.writer = csv.writer(self.file)
+        if self.file.tell() == 0:
+            self.writer.writerow(_CSV_FIELDNAMES)
+    
+    def write(self, result: ScrapeResult):
+        """Append a single result as one row"""
+        self.writer.writerow(_get_csv_fields(result))
+        self.count += 1
+    
+    def flush(self):
+        """Push buffered rows to the OS"""
+        self.file.flush()
+    
+    def close(self):
+        """Close the file"""
+        self.file.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+def _drop_records(output_file: str, suffix: str, urls: set) -> int:
+    """
+    Rewrite a .jsonl or .csv output file without the records for `urls`
+    
+    Args:
+        output_file: Path to the existing output file
+        suffix: '.jsonl' or '.csv'
+        urls: URLs whose records should be removed
+        
+    Returns:
+        Number of records removed
+    """
+    removed = 0
+    tmp_file = f'{output_file}.tmp'
+    if suffix == '.jsonl':
+        with open(output_file, 'rb') as src, open(tmp_file, 'wb', buffering=WRITE_BUFFER_SIZE) as dst:
+            for line in src:
+                if line.strip() and orjson.loads(line).get('url') in urls:
+                    removed += 1
+                else:
+                    dst.write(line)
+    else:
+        with open(output_file, newline='', encoding='utf-8') as src, \
+                open(tmp_file, 'w', newline='', encoding='utf-8', buffering=WRITE_BUFFER_SIZE) as dst:
+            reader = csv.reader(src)
+            writer = csv.writer(dst)
+            header = next(reader, None)
+            if header is not None:
+                writer.writerow(header)
+                url_index = header.index('url')
+                for row in reader:
+                    if len(row) > url_index and row[url_index] in urls:
+                        removed += 1
+                    else:
+                        writer.writerow(row)
+    os.replace(tmp_file, output_file)
+    return removed
+
+class ResultSink:
+    """
+    Stream ScrapeResults to an output file, picking the format from its extension
+    
+    Results are written the moment they are passed to write() and are not kept
+    afterwards, so memory use does not grow with the number of URLs.
+    .jsonl is the recommended format for large runs: every line is a complete
+    record, so an interrupted run still leaves usable output.
+    """
+    
+    formats = ('.jsonl', '.json', '.csv')
+    
+    def __init__(self, output_file: str, include_html: bool = False, append: bool = False,
+                 durable: bool = False, replace_urls: Iterable[str] = ()):
+        """
+        Open the output file
+        
+        Args:
+            output_file: Path to a .jsonl, .json or .csv file
+            include_html: Whether to keep the HTML field in JSON/JSONL records
+            append: Add to an existing output file instead of overwriting it
+                (.jsonl and .csv only), e.g. when resuming an interrupted run
+            durable: Flush after every record instead of once per 1 MiB buffer, so a
+                result is on disk before it is recorded in a resume cache
+            replace_urls: When appending, first drop existing records for these
+                URLs, so a URL that is scraped again keeps only its new record
+            
+        Raises:
+            ValueError: If the file extension is not a supported format, or
+                appending was requested for a .json file
+        """
+        suffix = Path(output_file).suffix.lower()
+        if suffix == '.jsonl':
+            self.writer = JsonlWriter(output_file, include_html=include_html, append=append)
+        elif suffix == '.json':
+            if append:
+                raise ValueError("Cannot append to a .json file; use .jsonl or .csv output instead")
+            self.writer = JsonArrayWriter(output_file, include_html=include_html)
+        elif suffix == '.csv':
+            self.writer = CsvWriter(output_file, append=append)
+        else:
+            raise ValueError(f"Unsupported output format '{suffix}'. Use one of: {', '.join(self.formats)}")
+        
+        replace_urls = set(replace_urls)
+        if append and replace_urls:
+            self.writer.close()
+            self.removed = _drop_records(output_file, suffix, replace_urls)
+            self.writer = (JsonlWriter(output_file, include_html=include_html) if suffix == '.jsonl'
+                           else CsvWriter(output_file, append=True))
+        else:
+            self.removed = 0
+        
+        self.output_file = output_file
+        self.durable = durable
+    
+    def write(self, result: ScrapeResult):
+        """Write a single result"""
+        self.writer.write(result)
+        if self.durable:
+            self.writer.flush()
+    
+    def close(self):
+        """Finish the output file"""
+        self.writer.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
 
 class FirecrawlCSVScraper:
     """Main scraper class for processing CSV URLs with Firecrawl"""
     
-    def __init__(self, api_key: str, delay: float = 1.0):
+    def __init__(self, api_key: str, delay: float = 1.0, resume_cache: Optional[ResumeCache] = None,
+                 max_retries: int = 3):
         """
         Initialize the scraper
         
         Args:
             api_key: Firecrawl API key
             delay: Delay between requests in seconds
+            resume_cache: Skip URLs this cache has already seen succeed, and
+                record every finished URL in it
+            max_retries: Maximum number of retries per API request, for
+                connection errors and 429/5xx responses
         """
         self.api_key = api_key
         self.delay = delay
-        self.app = FirecrawlApp(api_key=api_key)
+        self.max_retries = max_retries
+        self.resume_cache = resume_cache
+        self.invalid_urls = 0  # Rows skipped by the last iter_urls_from_csv() for not being http(s) URLs
+        self.duplicate_urls = 0  # Repeats of an earlier URL skipped by the last iter_urls_from_csv()
+        self.interrupted = False  # Set when scrape_urls_batch_async() was stopped early with Ctrl-C
+        self.api_url = FIRECRAWL_API_URL.rstrip('/')
         self.results: List[ScrapeResult] = []
+        self._reset_stats()
         
+        # Pooled keep-alive HTTP/2 client so each URL doesn't pay a new TCP+TLS handshake.
+        # JSON extraction can take ~60s per URL, so the timeout allows well beyond that.
+        # Retries live in the transport, so they reuse the pooled connections and
+        # honour Retry-After; a custom transport owns the HTTP/2 and pool settings.
+        self._headers = {'Authorization': f'Bearer {api_key}'}
+        self._client = httpx.Client(
+            timeout=120,
+            headers=self._headers,
+            transport=RetryTransport(
+                httpx.HTTPTransport(
+                    http2=True,
+                    limits=httpx.Limits(max_keepalive_connections=int(os.getenv('POOL_SIZE', 50)))
+                ),
+                max_retries=max_retries,
+                logger=logger
+            )
+        )
+        # Async counterpart shared by every async scrape call made through this scraper.
+        # Nothing connects until first use, so creating it outside an event loop is fine.
+        self._async_client = httpx.AsyncClient(
+            timeout=120,
+            headers=self._headers,
+            transport=AsyncRetryTransport(
+                httpx.AsyncHTTPTransport(
+                    http2=True,
+                    limits=httpx.Limits(max_connections=100, max_keepalive_connections=20)
+                ),
+                max_retries=max_retries,
+                logger=logger
+            )
+        )
+        atexit.register(self.close)
+    
+    def close(self):
+        """Close pooled HTTP connections"""
+        self._client.close()
+        atexit.unregister(self.close)
+    
+    def _reset_stats(self):
+        """Start a fresh set of running counters for print_summary"""
+        # Only the most recent failures are kept so a pathological run can't grow this without bound
+        self._stats = {'n': 0, 'ok': 0, 'fail': 0, 'sum_t': 0.0, 'failed_urls': deque(maxlen=1000)}
+    
+    def _record_result(self, result: ScrapeResult):
+        """Fold one result into the running counters and the resume cache"""
+        if self.resume_cache is not None:
+            self.resume_cache.mark(result.url, result.success)
+        
+        stats = self._stats
+        stats['n'] += 1
+        stats['sum_t'] += result.processing_time or 0
+        if result.success:
+            stats['ok'] += 1
+        else:
+            stats['fail'] += 1
+            stats['failed_urls'].append((result.url, result.error))
+    
+    async def aclose(self):
+        """Close pooled HTTP connections, including the async client's"""
+        await self._async_client.aclose()
+        self.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.aclose()
+        
+    def iter_urls_from_csv(self, csv_file: str, url_column: str = 'url') -> Iterator[str]:
+        """
+        Lazily yield URLs from a CSV file
+        
+        Only the current row (or, with pyarrow installed, the current block of
+        the URL column) is held in memory, so arbitrarily large URL lists can be
+        streamed straight into the scraper. Values that are not http(s)
+        URLs are skipped and counted in self.invalid_urls, as are URLs already
+        completed according to the resume cache. Repeats of a URL seen earlier
+        in the file are skipped and counted in self.duplicate_urls, so each
+        URL is only paid for once.
+        
+        Args:
+            csv_file: Path to CSV file
+            url_column: Name of the column containing URLs
+            
+        Yields:
+            Unique valid URLs in file order
+            
+        Raises:
+            ValueError: If the URL column is not in the CSV header
+        """
+        with open(csv_file, newline='', encoding='utf-8-sig') as f:
+            reader = csv.DictReader(f)
+            columns = reader.fieldnames or []
+            
+            if url_column not in columns:
+                available_columns = ', '.join(columns)
+                raise ValueError(f"Column '{url_column}' not found. Available columns: {available_columns}")
+            
+            self.invalid_urls = 0
+            self.duplicate_urls = 0
+            if pacsv is not None:
+                urls = _iter_column_arrow(csv_file, url_column)
+            else:
+                urls = _iter_column_csv(reader, url_column)
+            urls = self._valid_urls(urls)
+            if self.resume_cache is not None:
+                urls = self.resume_cache.pending(urls)
+            yield from self._unique_urls(urls)
+    
+    def _valid_urls(self, urls: Iterable[str]) -> Iterator[str]:
+        """Drop values that are not http(s) URLs, counting them in self.invalid_urls"""
+        for url in urls:
+            if _URL_RE.match(url):
+                yield url
+            else:
+                self.invalid_urls += 1
+                logger.debug("Skipping invalid URL: %r", url)
+    
+    def _unique_urls(self, urls: Iterable[str]) -> Iterator[str]:
+        """Drop repeats of URLs already yielded, counting them in self.duplicate_urls"""
+        seen = set()
+        for url in urls:
+            if url in seen:
+                self.duplicate_urls += 1
+            else:
+                seen.add(url)
+                yield url
+    
     def read_urls_from_csv(self, csv_file: str, url_column: str = 'url') -> List[str]:
         """
         Read URLs from CSV file
@@ -80,20 +641,28 @@ class FirecrawlCSVScraper:
             List of URLs
         """
         try:
-            df = pd.read_csv(csv_file)
-            
-            if url_column not in df.columns:
-                available_columns = ', '.join(df.columns.tolist())
-                raise ValueError(f"Column '{url_column}' not found. Available columns: {available_columns}")
-            
-            urls = df[url_column].dropna().tolist()
-            print(f"Loaded {len(urls)} URLs from {csv_file}")
+            urls = list(self.iter_urls_from_csv(csv_file, url_column))
+            self.print_csv_stats(csv_file, len(urls))
             return urls
             
         except Exception as e:
             print(f"Error reading CSV file: {e}")
             raise
     
+    def print_csv_stats(self, csv_file: str, count: int):
+        """
+        Report what the last iter_urls_from_csv() pass over a file read
+        
+        Args:
+            csv_file: Path to the CSV file that was read
+            count: Number of URLs the pass yielded
+        """
+        print(f"Loaded {count} URLs from {csv_file}")
+        if self.duplicate_urls:
+            print(f"🔁 Deduplicated {count + self.duplicate_urls}→{count} URLs")
+        if self.invalid_urls:
+            print(f"⚠️  Skipped {self.invalid_urls} invalid URLs (not http:// or https://)")
+    
     def scrape_url(self, url: str, formats: List[str] = None) -> ScrapeResult:
         """
         Scrape a single URL using Firecrawl
@@ -107,46 +676,39 @@ class FirecrawlCSVScraper:
         """
         if formats is None:
             formats = ['markdown', 'html']
+        
+        return self.scrape_url_advanced(url, {'formats': formats})
+    
+    def scrape_url_advanced(self, url: str, params: Dict[str, Any]) -> ScrapeResult:
+        """
+        Advanced scrape with custom parameters for Firecrawl v1 API
+        
+        Args:
+            url: URL to scrape
+            params: Dictionary of Firecrawl API parameters
             
-        start_time = time.time()
-        scraped_at = datetime.now().isoformat()
+        Returns:
+            ScrapeResult object
+        """
+        start_time = time.perf_counter()
+        scraped_at = utc_timestamp()
         
         try:
-            print(f"🕸️  Scraping: {url}")
-            
-            # Use Firecrawl to scrape the URL with correct v1 API parameters
-            result = self.app.scrape_url(url, formats=formats)
+            logger.debug("🕸️  Scraping: %s", url)
             
-            processing_time = time.time() - start_time
+            # Call the Firecrawl v1 scrape endpoint over the pooled connection;
+            # the client's transport retries 429s and 5xx responses
+            payload = self._scrape_payload(url, params)
+            response = self._client.post(f'{self.api_url}/v1/scrape', json=payload)
+            result = response.json()
             
-            if result.get('success', False) and result.get('data'):
-                data = result['data']
-                metadata = data.get('metadata', {})
-                
-                return ScrapeResult(
-                    url=url,
-                    success=True,
-                    status_code=metadata.get('statusCode'),
-                    title=metadata.get('title'),
-                    content=data.get('markdown'),
-                    html=data.get('html'),
-                    scraped_at=scraped_at,
-                    processing_time=processing_time
-                )
-            else:
-                error_msg = result.get('error', 'Unknown error occurred')
-                return ScrapeResult(
-                    url=url,
-                    success=False,
-                    error=error_msg,
-                    scraped_at=scraped_at,
-                    processing_time=processing_time
-                )
+            processing_time = time.perf_counter() - start_time
+            return self._build_result(url, result, scraped_at, processing_time)
                 
         except Exception as e:
-            processing_time = time.time() - start_time
+            processing_time = time.perf_counter() - start_time
             error_msg = str(e)
-            print(f"Error scraping {url}: {error_msg}")
+            logger.warning("Error scraping %s: %s", url, error_msg)
             
             return ScrapeResult(
                 url=url,
@@ -156,67 +718,243 @@ class FirecrawlCSVScraper:
                 processing_time=processing_time
             )
     
-    def scrape_url_advanced(self, url: str, params: Dict[str, Any]) -> ScrapeResult:
+    async def scrape_url_async(self, url: str, params: Dict[str, Any],
+                               limiter: Optional[RateLimiter] = None) -> ScrapeResult:
         """
-        Advanced scrape with custom parameters for Firecrawl v1 API
+        Async sibling of scrape_url_advanced that calls the Firecrawl v1 REST API directly
         
         Args:
             url: URL to scrape
-            params: Dictionary of Firecrawl API parameters
+            params: Dictionary of Firecrawl API parameters (SDK-style names)
+            limiter: Rate limiter to take a permit from before the request and
+                each retry. It is fed the responses' rate-limit headers, so a 429
+                or an exhausted quota holds back every request sharing it rather
+                than just this one.
             
         Returns:
             ScrapeResult object
         """
-        start_time = time.time()
-        scraped_at = datetime.now().isoformat()
+        start_time = time.perf_counter()
+        scraped_at = utc_timestamp()
         
         try:
-            print(f"🕸️  Scraping: {url}")
-            
-            # Use Firecrawl to scrape the URL with custom parameters
-            result = self.app.scrape_url(url, **params)
+            logger.debug("🕸️  Scraping: %s", url)
             
-            processing_time = time.time() - start_time
+            # 429s and 5xx responses are retried by the client's transport, which
+            # pauses the limiter and takes a new permit from it for each retry
+            payload = self._scrape_payload(url, params)
+            if limiter is not None:
+                async with limiter:
+                    response = await self._async_client.post(f'{self.api_url}/v1/scrape', json=payload,
+                                                             extensions={'rate_limiter': limiter})
+                limiter.update_from_headers(response.headers)
+            else:
+                response = await self._async_client.post(f'{self.api_url}/v1/scrape', json=payload)
+            result = response.json()
             
-            if result.get('success', False) and result.get('data'):
-                data = result['data']
-                metadata = data.get('metadata', {})
-                
-                # Handle different response formats
-                content = data.get('markdown', '')
-                html_content = data.get('html', '') or data.get('rawHtml', '')
-                
-                # Handle JSON extraction results
-                json_data = data.get('json', {})
-                if json_data and isinstance(json_data, dict):
-                    # Add JSON data to content
-                    content += f"\n\n---\nExtracted Data:\n{json.dumps(json_data, indent=2)}"
+            processing_time = time.perf_counter() - start_time
+            return self._build_result(url, result, scraped_at, processing_time)
                 
-                return ScrapeResult(
-                    url=url,
-                    success=True,
-                    status_code=metadata.get('statusCode'),
-                    title=metadata.get('title'),
-                    content=content,
-                    html=html_content,
-                    scraped_at=scraped_at,
-                    processing_time=processing_time
-                )
+        except Exception as e:
+            processing_time = time.perf_counter() - start_time
+            error_msg = str(e)
+            logger.warning("Error scraping %s: %s", url, error_msg)
+            
+            return ScrapeResult(
+                url=url,
+                success=False,
+                error=error_msg,
+                scraped_at=scraped_at,
+                processing_time=processing_time
+            )
+    
+    def scrape_batch(self, urls: List[str], params: Dict[str, Any],
+                     poll_interval: float = 2.0, timeout: float = BATCH_TIMEOUT) -> List[ScrapeResult]:
+        """
+        Scrape many URLs with a single Firecrawl batch scrape job
+        
+        Args:
+            urls: URLs to scrape in one batch
+            params: Dictionary of Firecrawl API parameters (SDK-style names)
+            poll_interval: Initial delay between job status polls, backed off exponentially
+            timeout: Seconds to wait for the batch job to complete
+            
+        Returns:
+            ScrapeResult objects in the same order as `urls`. processing_time is the
+            batch's wall time divided across its URLs.
+            
+        Raises:
+            RuntimeError: If the batch job could not be started, failed as a whole
+                or did not complete within `timeout`
+        """
+        steps = self._batch_steps(urls, params, poll_interval, timeout)
+        reply = None
+        while True:
+            try:
+                step = steps.send(reply)
+            except StopIteration as done:
+                return done.value
+            if isinstance(step, float):
+                time.sleep(step)
+                reply = None
             else:
-                error_msg = result.get('error', 'Unknown error occurred')
-                return ScrapeResult(
+                url, payload = step
+                response = self._client.get(url) if payload is None else self._client.post(url, json=payload)
+                reply = response.json()
+    
+    async def scrape_batch_async(self, urls: List[str], params: Dict[str, Any],
+                                 poll_interval: float = 2.0,
+                                 timeout: float = BATCH_TIMEOUT) -> List[ScrapeResult]:
+        """
+        Async sibling of scrape_batch
+        
+        Args:
+            urls: URLs to scrape in one batch
+            params: Dictionary of Firecrawl API parameters (SDK-style names)
+            poll_interval: Initial delay between job status polls, backed off exponentially
+            timeout: Seconds to wait for the batch job to complete
+            
+        Returns:
+            ScrapeResult objects in the same order as `urls`
+            
+        Raises:
+            RuntimeError: If the batch job could not be started, failed as a whole
+                or did not complete within `timeout`
+        """
+        client = self._async_client
+        steps = self._batch_steps(urls, params, poll_interval, timeout)
+        reply = None
+        while True:
+            try:
+                step = steps.send(reply)
+            except StopIteration as done:
+                return done.value
+            if isinstance(step, float):
+                await asyncio.sleep(step)
+                reply = None
+            else:
+                url, payload = step
+                response = await (client.get(url) if payload is None else client.post(url, json=payload))
+                reply = response.json()
+    
+    def _batch_steps(self, urls: List[str], params: Dict[str, Any], poll_interval: float,
+                     timeout: float) -> Generator[Any, Optional[Dict[str, Any]], List[ScrapeResult]]:
+        """
+        Run one batch scrape job without doing any I/O itself
+        
+        Shared by scrape_batch and scrape_batch_async, which only carry out the
+        steps this generator yields: a float is a number of seconds to sleep, and
+        a (url, payload) tuple is a request to send back the decoded JSON
+        response for, POSTing `payload` or GETting `url` when it is None.
+        
+        Returns:
+            ScrapeResult objects in the same order as `urls`, as the generator's
+            return value
+        """
+        start_time = time.perf_counter()
+        scraped_at = utc_timestamp()
+        logger.debug("🕸️  Batch scraping %d URLs", len(urls))
+        
+        job = yield f'{self.api_url}/v1/batch/scrape', self._batch_payload(urls, params)
+        if not job.get('success') or not job.get('id'):
+            raise RuntimeError(job.get('error', 'Batch scrape could not be started'))
+        status_url = f"{self.api_url}/v1/batch/scrape/{job['id']}"
+        
+        # Poll with exponential backoff until Firecrawl finishes the batch
+        deadline = time.monotonic() + timeout
+        wait = poll_interval
+        while True:
+            yield float(max(0.0, min(wait, deadline - time.monotonic())))
+            status = yield status_url, None
+            if status.get('status') == 'completed':
+                break
+            if status.get('status') == 'failed' or status.get('success') is False:
+                raise RuntimeError(status.get('error', 'Batch scrape failed'))
+            if time.monotonic() >= deadline:
+                raise RuntimeError(f"Batch scrape {job['id']} did not complete within {timeout:.0f}s")
+            wait = min(wait * 1.5, 30)
+        
+        # Completed results may be paginated
+        data = list(status.get('data') or [])
+        next_url = status.get('next')
+        while next_url:
+            page = yield next_url, None
+            data.extend(page.get('data') or [])
+            next_url = page.get('next')
+        
+        # URLs missing from the results failed; fetch their individual errors
+        errors = {}
+        if len(data) < len(urls):
+            errors_response = yield f'{status_url}/errors', None
+            errors = {item.get('url'): item.get('error') for item in errors_response.get('errors') or []}
+        
+        processing_time = (time.perf_counter() - start_time) / len(urls)
+        return self._batch_results(urls, data, errors, scraped_at, processing_time)
+    
+    def _scrape_payload(self, url: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Build a v1 scrape request body from SDK-style parameters"""
+        payload = {'url': url}
+        payload.update({_to_camel(key): value for key, value in params.items()})
+        return payload
+    
+    def _batch_payload(self, urls: List[str], params: Dict[str, Any]) -> Dict[str, Any]:
+        """Build a v1 batch scrape request body from SDK-style parameters"""
+        payload = {'urls': list(urls)}
+        payload.update({_to_camel(key): value for key, value in params.items()})
+        return payload
+    
+    def _batch_results(self, urls: List[str], data: List[Dict[str, Any]], errors: Dict[str, str],
+                       scraped_at: str, processing_time: float) -> List[ScrapeResult]:
+        """Match batch scrape documents back to the requested URLs"""
+        documents = {}
+        for document in data:
+            metadata = document.get('metadata') or {}
+            documents[metadata.get('sourceURL') or metadata.get('url')] = document
+        
+        results = []
+        for url in urls:
+            document = documents.get(url)
+            if document is not None:
+                results.append(self._build_result(url, {'success': True, 'data': document},
+                                                  scraped_at, processing_time))
+            else:
+                results.append(ScrapeResult(
                     url=url,
                     success=False,
-                    error=error_msg,
+                    error=errors.get(url) or 'No result returned by batch scrape',
                     scraped_at=scraped_at,
                     processing_time=processing_time
-                )
-                
-        except Exception as e:
-            processing_time = time.time() - start_time
-            error_msg = str(e)
-            print(f"Error scraping {url}: {error_msg}")
+                ))
+        return results
+    
+    def _build_result(self, url: str, result: Dict[str, Any], scraped_at: str,
+                      processing_time: float) -> ScrapeResult:
+        """Convert a Firecrawl v1 scrape response into a ScrapeResult"""
+        if result.get('success', False) and result.get('data'):
+            data = result['data']
+            metadata = data.get('metadata', {})
+            
+            # Handle different response formats
+            content = data.get('markdown', '')
+            html_content = data.get('html', '') or data.get('rawHtml', '')
+            
+            # JSON extraction results are kept as-is and only encoded at export time
+            json_data = data.get('json')
+            extracted = json_data if isinstance(json_data, dict) and json_data else None
             
+            return ScrapeResult(
+                url=url,
+                success=True,
+                status_code=metadata.get('statusCode'),
+                title=metadata.get('title'),
+                content=content,
+                extracted=extracted,
+                html_text=html_content,
+                scraped_at=scraped_at,
+                processing_time=processing_time
+            )
+        else:
+            error_msg = result.get('error', 'Unknown error occurred')
             return ScrapeResult(
                 url=url,
                 success=False,
@@ -225,73 +963,287 @@ class FirecrawlCSVScraper:
                 processing_time=processing_time
             )
     
-    def scrape_urls_batch(self, urls: List[str], formats: List[str] = None, 
-                         max_retries: int = 3) -> List[ScrapeResult]:
+    def scrape_urls_batch(self, urls: Iterable[str], formats: List[str] = None, 
+                         total: Optional[int] = None,
+                         sink: Optional[ResultSink] = None) -> List[ScrapeResult]:
+        """
+        Scrape multiple URLs one at a time
+        
+        Failed requests are retried by the HTTP transport (see self.max_retries),
+        so each URL is a single pass here.
+        
+        Args:
+            urls: URLs to scrape; any iterable, e.g. iter_urls_from_csv()
+            formats: List of formats to return
+            total: Number of URLs, for progress output. Taken from len(urls) when
+                urls is a sized collection; unknown for plain iterators.
+            sink: Write each result here as soon as it is scraped instead of
+                keeping it in memory
+            
+        Returns:
+            List of ScrapeResult objects (empty when a sink is given)
+        """
+        results = []
+        self._reset_stats()
+        if total is None and hasattr(urls, '__len__'):
+            total = len(urls)
+        
+        # Requests start at most once per self.delay; time spent waiting on the
+        # previous response counts towards it instead of being followed by a full sleep
+        next_request_at = 0.0
+        progress = tqdm(total=total, unit='url', desc='Scraping', disable=None)
+        
+        for url in urls:
+            wait = next_request_at - time.monotonic()
+            if wait > 0:
+                time.sleep(wait)
+            next_request_at = time.monotonic() + self.delay
+            
+            result = self.scrape_url(url, formats)
+            if result.success:
+                logger.debug("✓ Successfully scraped: %s", url)
+            else:
+                logger.info("✗ Failed to scrape: %s - %s", url, result.error)
+            
+            if sink is not None:
+                sink.write(result)
+            else:
+                result.compress_html()  # Results kept in memory hold their HTML compressed
+                results.append(result)
+            self._record_result(result)
+            progress.update(1)
+        
+        progress.close()
+        self.results = results
+        return results
+    
+    def scrape_urls_firecrawl_batch(self, urls: Iterable[str], formats: List[str] = None,
+                                    batch_size: int = 50, total: Optional[int] = None,
+                                    sink: Optional[ResultSink] = None) -> List[ScrapeResult]:
         """
-        Scrape multiple URLs with error handling and retries
+        Scrape URLs through Firecrawl's batch scrape endpoint, `batch_size` at a time
+        
+        Each chunk is one batch job, so the client makes a handful of requests per
+        chunk instead of one per URL. A chunk whose batch job fails as a whole is
+        retried one URL at a time.
         
         Args:
-            urls: List of URLs to scrape
+            urls: URLs to scrape; any iterable, consumed one chunk at a time
             formats: List of formats to return
-            max_retries: Maximum number of retries per URL
+            batch_size: Number of URLs submitted per batch job
+            total: Number of URLs, for progress output. Taken from len(urls) when
+                urls is a sized collection.
+            sink: Write each result here as soon as its chunk finishes instead of
+                keeping it in memory
             
         Returns:
-            List of ScrapeResult objects
+            List of ScrapeResult objects (empty when a sink is given)
         """
+        if formats is None:
+            formats = ['markdown', 'html']
+        
+        params = {'formats': formats}
         results = []
-        total_urls = len(urls)
+        self._reset_stats()
+        if total is None and hasattr(urls, '__len__'):
+            total = len(urls)
         
-        for i, url in enumerate(urls, 1):
-            print(f"\nProgress: {i}/{total_urls} ({i/total_urls*100:.1f}%)")
+        progress = tqdm(total=total, unit='url', desc='Scraping', disable=None)
+        url_iter = iter(urls)
+        while True:
+            chunk = list(itertools.islice(url_iter, batch_size))
+            if not chunk:
+                break
+            
+            try:
+                chunk_results = self.scrape_batch(chunk, params)
+            except Exception as e:
+                logger.warning("Batch of %d URLs failed (%s), falling back to per-URL scraping", len(chunk), e)
+                chunk_results = []
+                for i, url in enumerate(chunk):
+                    if i:
+                        time.sleep(self.delay)
+                    chunk_results.append(self.scrape_url(url, formats))
             
-            # Retry logic
-            for attempt in range(max_retries + 1):
-                try:
-                    result = self.scrape_url(url, formats)
+            for result in chunk_results:
+                if result.success:
+                    logger.debug("✓ Successfully scraped: %s", result.url)
+                else:
+                    logger.info("✗ Failed to scrape: %s - %s", result.url, result.error)
+                
+                if sink is not None:
+                    sink.write(result)
+                else:
+                    result.compress_html()  # Results kept in memory hold their HTML compressed
                     results.append(result)
+                self._record_result(result)
+            
+            progress.update(len(chunk))
+        
+        progress.close()
+        self.results = results
+        return results
+    
+    async def scrape_urls_batch_async(self, urls: Iterable[str], formats: List[str] = None,
+                                      concurrency: int = 10,
+                                      sink: Optional[ResultSink] = None,
+                                      total: Optional[int] = None) -> List[ScrapeResult]:
+        """
+        Scrape multiple URLs concurrently
+        
+        Work flows through a three-stage pipeline joined by bounded queues: a
+        producer feeds URLs from `urls`, `concurrency` workers scrape them, and
+        a single writer records each result as it arrives. The queues keep only
+        a bounded number of URLs and results in memory however long the input
+        is, and the single writer means the sink never needs a lock. self.delay
+        sets the overall request rate (1 / delay requests per second) instead of
+        a pause after every URL.
+        
+        Failed requests are retried by the HTTP transport (see self.max_retries).
+        
+        Ctrl-C stops the producer; URLs already being scraped finish and are
+        written before the method returns with self.interrupted set. A second
+        Ctrl-C aborts immediately.
+        
+        Args:
+            urls: URLs to scrape; any iterable, consumed as workers free up
+            formats: List of formats to return
+            concurrency: Maximum number of simultaneous requests
+            sink: Write each result here as soon as it completes instead of
+                keeping it in memory
+            total: Number of URLs, for progress output. Taken from len(urls) when
+                urls is a sized collection.
+            
+        Returns:
+            List of ScrapeResult objects in completion order (empty when a sink
+            is given)
+            
+        Raises:
+            ValueError: If concurrency is less than 1
+        """
+        if concurrency < 1:
+            raise ValueError(f"concurrency must be at least 1, got {concurrency}")
+        if formats is None:
+            formats = ['markdown', 'html']
+        if total is None and hasattr(urls, '__len__'):
+            total = len(urls)
+        
+        params = {'formats': formats}
+        limiter = RateLimiter(requests_per_second=1.0 / self.delay) if self.delay > 0 else None
+        url_queue = asyncio.Queue(maxsize=PIPELINE_QUEUE_SIZE)
+        result_queue = asyncio.Queue(maxsize=PIPELINE_QUEUE_SIZE)
+        stop = asyncio.Event()
+        results = []
+        workers_left = concurrency
+        self.interrupted = False
+        self._reset_stats()
+        
+        async def produce():
+            for url in urls:
+                if stop.is_set():
+                    break
+                await url_queue.put(url)
+            for _ in range(concurrency):
+                await url_queue.put(None)  # One sentinel per worker
+        
+        async def work():
+            nonlocal workers_left
+            while True:
+                url = await url_queue.get()
+                if url is None:
+                    workers_left -= 1
+                    if workers_left == 0:
+                        await result_queue.put(None)  # Last worker out tells the writer to finish
+                    return
+                if stop.is_set():
+                    continue  # Shutting down: drop URLs that haven't started
+                
+                result = await self.scrape_url_async(url, params, limiter=limiter)
+                await result_queue.put(result)
+        
+        async def write():
+            with tqdm(total=total, unit='url', desc='Scraping', disable=None) as progress:
+                while True:
+                    result = await result_queue.get()
+                    if result is None:
+                        return
                     
-                    if result.success:
-                        print(f"✓ Successfully scraped: {url}")
+                    if sink is not None:
+                        sink.write(result)
                     else:
-                        print(f"✗ Failed to scrape: {url} - {result.error}")
-                    
-                    break  # Success or final failure, exit retry loop
+                        result.compress_html()  # Results kept in memory hold their HTML compressed
+                        results.append(result)
+                    self._record_result(result)
+                    progress.update(1)
                     
-                except Exception as e:
-                    if attempt < max_retries:
-                        wait_time = (attempt + 1) * 2  # Exponential backoff
-                        print(f"Attempt {attempt + 1} failed for {url}, retrying in {wait_time}s...")
-                        time.sleep(wait_time)
+                    if result.success:
+                        logger.debug("✓ Successfully scraped: %s", result.url)
                     else:
-                        # Final attempt failed
-                        result = ScrapeResult(
-                            url=url,
-                            success=False,
-                            error=f"Failed after {max_retries} retries: {str(e)}",
-                            scraped_at=datetime.now().isoformat()
-                        )
-                        results.append(result)
-                        print(f"✗ Final failure for: {url}")
-            
-            # Rate limiting delay
-            if i < total_urls:  # Don't delay after the last URL
-                time.sleep(self.delay)
+                        logger.info("✗ Failed to scrape: %s - %s", result.url, result.error)
+        
+        def on_interrupt():
+            if stop.is_set():
+                # Second Ctrl-C: restore the default handler and abort
+                loop.remove_signal_handler(signal.SIGINT)
+                raise KeyboardInterrupt
+            logger.warning("⏹️  Stopping: finishing in-flight URLs (Ctrl-C again to abort)")
+            stop.set()
+        
+        loop = asyncio.get_running_loop()
+        try:
+            loop.add_signal_handler(signal.SIGINT, on_interrupt)
+            handles_sigint = True
+        except (NotImplementedError, RuntimeError, ValueError):
+            handles_sigint = False  # Not available on Windows or outside the main thread
+        
+        tasks = [asyncio.create_task(produce()), asyncio.create_task(write())]
+        tasks += [asyncio.create_task(work()) for _ in range(concurrency)]
+        try:
+            # Every stage finishes on its own; stop early only if one of them fails,
+            # since the others could otherwise block forever on a full queue
+            done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
+            for task in done:
+                task.result()
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            if handles_sigint:
+                loop.remove_signal_handler(signal.SIGINT)
         
+        self.interrupted = stop.is_set()
         self.results = results
         return results
     
-    def export_to_json(self, output_file: str, include_html: bool = False):
-        """Export results to JSON file"""
-        export_data = []
+    def export_to_json(self, output_file: str, include_html: bool = False,
+                       results: Optional[Iterable[ScrapeResult]] = None):
+        """
+        Export results to JSON file
         
-        for result in self.results:
-            data = asdict(result)
-            if not include_html:
-                data.pop('html', None)  # Remove HTML to reduce file size
-            export_data.append(data)
+        Args:
+            output_file: Path to the JSON file to write
+            include_html: Whether to include HTML content
+            results: Results to export; defaults to self.results. Passing them in
+                directly means the scraper never has to hold on to the list.
+        """
+        if results is None:
+            results = self.results
         
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(export_data, f, ensure_ascii=False, indent=2)
+        # Each record is encoded with orjson and written straight out, so no
+        # intermediate list of dicts or pretty-printed string is built
+        with JsonArrayWriter(output_file, include_html=include_html) as writer:
+            for result in results:
+                writer.write(result)
+        
+        print(f"Results exported to {output_file}")
+    
+    def export_jsonl_to_json(self, jsonl_file: str, output_file: str):
+        """Convert a JSON Lines results file into a JSON array, one record at a time"""
+        with open(jsonl_file, 'rb') as src, JsonArrayWriter(output_file) as writer:
+            for line in src:
+                line = line.strip()
+                if line:
+                    writer.write_record(line)
         
         print(f"Results exported to {output_file}")
     
@@ -301,42 +1253,48 @@ class FirecrawlCSVScraper:
             print("No results to export")
             return
         
-        fieldnames = ['url', 'success', 'status_code', 'title', 'error', 'scraped_at', 'processing_time']
-        
-        with open(output_file, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.DictWriter(f, fieldnames=fieldnames)
-            writer.writeheader()
-            
+        with CsvWriter(output_file) as writer:
             for result in self.results:
-                row = {field: getattr(result, field) for field in fieldnames}
-                writer.writerow(row)
+                writer.write(result)
         
         print(f"Results exported to {output_file}")
     
     def print_summary(self):
-        """Print scraping summary statistics"""
-        if not self.results:
+        """Print scraping summary statistics from the running counters"""
+        stats = self._stats
+        total = stats['n']
+        if not total:
             print("No results to summarize")
             return
         
-        successful = sum(1 for r in self.results if r.success)
-        failed = len(self.results) - successful
-        avg_time = sum(r.processing_time or 0 for r in self.results) / len(self.results)
+        successful = stats['ok']
+        failed = stats['fail']
+        avg_time = stats['sum_t'] / total
         
         print(f"\n{'='*50}")
         print("SCRAPING SUMMARY")
         print(f"{'='*50}")
-        print(f"Total URLs processed: {len(self.results)}")
+        print(f"Total URLs processed: {total}")
         print(f"Successful: {successful}")
         print(f"Failed: {failed}")
-        print(f"Success rate: {successful/len(self.results)*100:.1f}%")
+        print(f"Success rate: {successful/total*100:.1f}%")
         print(f"Average processing time: {avg_time:.2f}s")
         
         if failed > 0:
-            print(f"\nFailed URLs:")
-            for result in self.results:
-                if not result.success:
-                    print(f"  - {result.url}: {result.error}")
+            failed_urls = stats['failed_urls']
+            if failed > len(failed_urls):
+                print(f"\nFailed URLs (last {len(failed_urls)} of {failed}):")
+            else:
+                print(f"\nFailed URLs:")
+            for url, error in failed_urls:
+                print(f"  - {url}: {error}")
+
+def _positive_int(value: str) -> int:
+    """argparse type for options that must be at least 1"""
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {value}")
+    return number
 
 def main():
     """Main function with CLI argument parsing"""
@@ -346,8 +1304,12 @@ def main():
         epilog="""
 Examples:
   %(prog)s --input urls.csv --output results.json
+  %(prog)s --input urls.csv --output results.jsonl
   %(prog)s --input sites.csv --url-column website --output data.json --formats markdown
   %(prog)s --input urls.csv --output results.csv --delay 2.0 --max-retries 5
+  %(prog)s --input urls.csv --output results.json --concurrency 20 --delay 0.1
+  %(prog)s --input urls.csv --output results.jsonl --batch-size 50
+  %(prog)s --input urls.csv --output results.jsonl --resume progress.db
         """
     )
     
@@ -360,7 +1322,7 @@ Examples:
     parser.add_argument(
         '--output', '-o',
         required=True,
-        help='Output file (JSON or CSV format based on extension)'
+        help='Output file (.jsonl, .json or .csv; format based on extension). .jsonl is recommended for large runs'
     )
     
     parser.add_argument(
@@ -387,14 +1349,36 @@ Examples:
         '--delay',
         type=float,
         default=1.0,
-        help='Delay between requests in seconds (default: 1.0)'
+        help='Delay between requests in seconds; sets the overall request rate (default: 1.0)'
+    )
+    
+    parser.add_argument(
+        '--concurrency',
+        type=_positive_int,
+        default=10,
+        help='Maximum number of simultaneous requests (default: 10)'
+    )
+    
+    parser.add_argument(
+        '--batch-size',
+        type=int,
+        default=0,
+        help="Submit URLs to Firecrawl's batch scrape endpoint in groups of this size "
+             "instead of one request per URL (default: 0, disabled)"
     )
     
     parser.add_argument(
         '--max-retries',
         type=int,
         default=3,
-        help='Maximum retries per URL (default: 3)'
+        help='Maximum retries per API request on connection errors, 429 and 5xx responses (default: 3)'
+    )
+    
+    parser.add_argument(
+        '--resume',
+        metavar='PATH.db',
+        help='SQLite file recording finished URLs; rerunning with the same file skips URLs '
+             'that already succeeded and appends to the output (.jsonl or .csv only)'
     )
     
     parser.add_argument(
@@ -415,51 +1399,107 @@ Examples:
         print(f"Error: Input file '{args.input}' not found")
         sys.exit(1)
     
+    # Validate output format
+    if Path(args.output).suffix.lower() not in ResultSink.formats:
+        print("Error: Output file must have .jsonl, .json or .csv extension")
+        sys.exit(1)
+    if args.resume and Path(args.output).suffix.lower() == '.json':
+        print("Error: --resume appends to the output file, so it needs .jsonl or .csv output")
+        sys.exit(1)
+    
+    resume_cache = ResumeCache(args.resume) if args.resume else None
+    log_listener = setup_logging(os.getenv('LOG_LEVEL', 'INFO'))
+    
     try:
         # Initialize scraper
         scraper = FirecrawlCSVScraper(
             api_key=args.api_key,
-            delay=args.delay
+            delay=args.delay,
+            resume_cache=resume_cache,
+            max_retries=args.max_retries
         )
         
         # Read URLs from CSV
-        urls = scraper.read_urls_from_csv(args.input, args.url_column)
+        # Count the URLs first, only for the progress bar total: the scrape itself
+        # streams them from the file again instead of holding them all in memory.
+        # URLs that failed last time are scraped again; their old failure records
+        # are dropped so each URL ends up with a single record in the output.
+        resuming = resume_cache is not None
+        failed = resume_cache.failed() if resuming else set()
+        retried = set()
+        total = 0
+        try:
+            for url in scraper.iter_urls_from_csv(args.input, args.url_column):
+                total += 1
+                if url in failed:
+                    retried.add(url)
+        except Exception as e:
+            print(f"Error reading CSV file: {e}")
+            raise
+        scraper.print_csv_stats(args.input, total)
+        
+        if resuming and resume_cache.skipped:
+            print(f"⏭️  Skipping {resume_cache.skipped} URLs already scraped according to {args.resume}")
+            if not total:
+                print("Nothing left to scrape")
+                return
         
-        if not urls:
+        if not total:
             print("No URLs found in CSV file")
             sys.exit(1)
         
-        print(f"Starting to scrape {len(urls)} URLs with Firecrawl...")
+        print(f"Starting to scrape {total} URLs with Firecrawl...")
         print(f"Formats: {', '.join(args.formats)}")
         print(f"Delay: {args.delay}s between requests")
+        if args.batch_size > 0:
+            print(f"Batch size: {args.batch_size}")
+        else:
+            print(f"Concurrency: {args.concurrency}")
         print(f"Max retries: {args.max_retries}")
         
-        # Scrape URLs
-        results = scraper.scrape_urls_batch(
-            urls=urls,
-            formats=args.formats,
-            max_retries=args.max_retries
-        )
+        # Scrape URLs, writing each result to the output file as it completes.
+        # The scraper's async connection pool is closed inside the same event loop.
+        urls = scraper.iter_urls_from_csv(args.input, args.url_column)
+        sink = ResultSink(args.output, include_html=args.include_html, append=resuming, durable=resuming,
+                          replace_urls=retried)
+        if sink.removed:
+            print(f"🔄 Retrying {sink.removed} URLs that failed last time; their old records were replaced")
         
-        # Export results
-        output_path = Path(args.output)
-        if output_path.suffix.lower() == '.json':
-            scraper.export_to_json(args.output, include_html=args.include_html)
-        elif output_path.suffix.lower() == '.csv':
-            scraper.export_to_csv(args.output)
-        else:
-            print("Error: Output file must have .json or .csv extension")
-            sys.exit(1)
+        async def scrape():
+            async with scraper:
+                await scraper.scrape_urls_batch_async(
+                    urls=urls,
+                    formats=args.formats,
+                    concurrency=args.concurrency,
+                    sink=sink,
+                    total=total
+                )
+        
+        with sink:
+            if args.batch_size > 0:
+                scraper.scrape_urls_firecrawl_batch(urls, formats=args.formats, batch_size=args.batch_size,
+                                                    total=total, sink=sink)
+            else:
+                asyncio.run(scrape())
+        print(f"Results exported to {args.output}")
         
         # Print summary
         scraper.print_summary()
         
+        if scraper.interrupted:
+            print("\nScraping interrupted by user; results finished so far were saved")
+            sys.exit(1)
+        
     except KeyboardInterrupt:
         print("\nScraping interrupted by user")
         sys.exit(1)
     except Exception as e:
         print(f"Error: {e}")
         sys.exit(1)
+    finally:
+        log_listener.stop()
+        if resume_cache is not None:
+            resume_cache.close()
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Redis-backed job queue for the Firecrawl CSV Scraper web application
+
+Jobs are pushed onto `jobs:pending` by the web process and claimed by
+worker processes with BRPOPLPUSH, which atomically moves them onto
+`jobs:inflight`. A claimed job stays in the inflight list until the worker
+acknowledges it, so a worker that dies mid-job leaves it there; the
+reclaimer moves jobs whose heartbeat is older than the visibility timeout
+back onto the pending list.
+
+Payloads are stored as plain JSON, both in the lists and as field names of
+the `jobs:claimed` hash, so anything secret in a payload (such as an API
+key entered in the upload form) is readable by anyone with Redis access.
+"""
+
+import json
+import os
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from job_store import get_redis
+
+PENDING_KEY = 'jobs:pending'
+INFLIGHT_KEY = 'jobs:inflight'
+CLAIMED_KEY = 'jobs:claimed'  # hash of raw job payload -> last heartbeat timestamp
+
+# Moves an expired job from the inflight list back to the pending list in one
+# step, so a reclaimer that dies midway cannot lose it. The heartbeat is
+# checked again inside the script in case the worker stamped it meanwhile.
+REQUEUE_SCRIPT = """
+local claimed_at = redis.call('HGET', KEYS[2], ARGV[1])
+if not claimed_at or tonumber(claimed_at) > tonumber(ARGV[2]) then
+    return 0
+end
+if redis.call('LREM', KEYS[1], 1, ARGV[1]) == 0 then
+    return 0
+end
+redis.call('RPUSH', KEYS[3], ARGV[1])  -- right end, so it is claimed next
+redis.call('HDEL', KEYS[2], ARGV[1])
+return 1
+"""
+
+
+class JobQueue:
+    """Reliable job queue using the Redis pending/inflight list pattern"""
+
+    def __init__(self, client, visibility_timeout: float = 300):
+        """
+        Initialize the queue
+
+        Args:
+            client: redis.Redis client
+            visibility_timeout: Seconds without a heartbeat before an inflight job is reclaimed
+        """
+        self.redis = client
+        self.visibility_timeout = visibility_timeout
+        self._requeue = client.register_script(REQUEUE_SCRIPT)
+
+    def push(self, payload: Dict[str, Any]):
+        """Add a job to the pending queue"""
+        self.redis.lpush(PENDING_KEY, json.dumps(payload))
+
+    def claim(self, timeout: int = 0) -> Optional[Tuple[bytes, Dict[str, Any]]]:
+        """
+        Block until a job is available and move it to the inflight list
+
+        Args:
+            timeout: Seconds to wait for a job (0 waits forever)
+
+        Returns:
+            (raw, payload) tuple, or None if the timeout expired
+        """
+        raw = self.redis.brpoplpush(PENDING_KEY, INFLIGHT_KEY, timeout)
+        if raw is None:
+            return None
+        self.heartbeat(raw)
+        return raw, json.loads(raw)
+
+    def heartbeat(self, raw: bytes):
+        """Record that a claimed job is still being worked on"""
+        self.redis.hset(CLAIMED_KEY, raw, time.time())
+
+    def ack(self, raw: bytes):
+        """Remove a finished job from the inflight list"""
+        pipe = self.redis.pipeline()
+        pipe.lrem(INFLIGHT_KEY, 1, raw)
+        pipe.hdel(CLAIMED_KEY, raw)
+        pipe.execute()
+
+    def reclaim(self) -> int:
+        """
+        Move inflight jobs whose heartbeat has expired back to the pending queue
+
+        Returns:
+            Number of jobs reclaimed
+        """
+        now = time.time()
+        reclaimed = 0
+
+        for raw in self.redis.lrange(INFLIGHT_KEY, 0, -1):
+            claimed_at = self.redis.hget(CLAIMED_KEY, raw)
+            if claimed_at is None:
+                # Claimed but not yet stamped (or the worker died in between): start the clock now
+                self.redis.hsetnx(CLAIMED_KEY, raw, now)
+                continue
+            if now - float(claimed_at) < self.visibility_timeout:
+                continue
+            reclaimed += self._requeue(keys=[INFLIGHT_KEY, CLAIMED_KEY, PENDING_KEY],
+                                       args=[raw, now - self.visibility_timeout])
+
+        return reclaimed
+
+
+def create_job_queue() -> Optional[JobQueue]:
+    """Create a JobQueue if REDIS_URL is set, otherwise None"""
+    client = get_redis()
+    if client is None:
+        return None
+    return JobQueue(client, visibility_timeout=float(os.getenv('JOB_VISIBILITY_TIMEOUT', 300)))
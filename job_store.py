@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Job status storage for the Firecrawl CSV Scraper web application
+
+Job status lives in Redis hashes (one `job:<id>` hash per job) so every
+Gunicorn worker and background scraper process sees the same state. When
+REDIS_URL is not configured, an in-process dictionary with the same
+interface is used instead, which is enough for local single-process use.
+"""
+
+import os
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+import orjson
+
+JOB_KEY_PREFIX = 'job:'
+JOB_TTL_SECONDS = 24 * 60 * 60  # Garbage-collect old jobs after a day
+
+
+def _encode(value: Any) -> bytes:
+    """Encode a field value for storage in a Redis hash"""
+    return orjson.dumps(value)
+
+
+def _decode(value) -> Any:
+    """Decode a field value read back from a Redis hash"""
+    return orjson.loads(value)
+
+
+def get_redis():
+    """Return a Redis client for REDIS_URL, or None if Redis is not configured"""
+    redis_url = os.getenv('REDIS_URL')
+    if not redis_url:
+        return None
+
+    import redis
+    return redis.Redis.from_url(redis_url)
+
+
+class JobStore:
+    """Redis-backed job status store"""
+
+    def __init__(self, client):
+        """
+        Initialize the store
+
+        Args:
+            client: redis.Redis client
+        """
+        self.redis = client
+
+    @staticmethod
+    def _key(job_id: str) -> str:
+        return f'{JOB_KEY_PREFIX}{job_id}'
+
+    def create(self, job_id: str, fields: Dict[str, Any]):
+        """Create a job hash with its initial fields"""
+        key = self._key(job_id)
+        pipe = self.redis.pipeline()
+        pipe.delete(key)
+        pipe.hset(key, mapping={name: _encode(value) for name, value in fields.items()})
+        pipe.expire(key, JOB_TTL_SECONDS)
+        pipe.execute()
+
+    def exists(self, job_id: str) -> bool:
+        """Check whether a job exists"""
+        return bool(self.redis.exists(self._key(job_id)))
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Return all fields of a job, or None if it does not exist"""
+        raw = self.redis.hgetall(self._key(job_id))
+        if not raw:
+            return None
+        return {name.decode(): _decode(value) for name, value in raw.items()}
+
+    def get_field(self, job_id: str, field: str, default: Any = None) -> Any:
+        """Return a single job field"""
+        value = self.redis.hget(self._key(job_id), field)
+        return default if value is None else _decode(value)
+
+    def get_fields(self, job_id: str, *fields: str) -> List[Any]:
+        """Return several job fields in one round trip (None for missing fields)"""
+        values = self.redis.hmget(self._key(job_id), fields)
+        return [None if value is None else _decode(value) for value in values]
+
+    def update(self, job_id: str, **fields):
+        """Set one or more job fields"""
+        key = self._key(job_id)
+        pipe = self.redis.pipeline()
+        pipe.hset(key, mapping={name: _encode(value) for name, value in fields.items()})
+        pipe.expire(key, JOB_TTL_SECONDS)
+        pipe.execute()
+
+    def incr(self, job_id: str, field: str, amount: int = 1) -> int:
+        """Atomically increment an integer job field and return the new value"""
+        return self.redis.hincrby(self._key(job_id), field, amount)
+
+    def list_jobs(self) -> List[Tuple[str, Dict[str, Any]]]:
+        """Return (job_id, fields) pairs for every stored job"""
+        keys = list(self.redis.scan_iter(match=f'{JOB_KEY_PREFIX}*', count=500))
+        pipe = self.redis.pipeline()
+        for key in keys:
+            pipe.hgetall(key)
+
+        jobs = []
+        for key, raw in zip(keys, pipe.execute()):
+            if raw:
+                job_id = key.decode()[len(JOB_KEY_PREFIX):]
+                jobs.append((job_id, {name.decode(): _decode(value) for name, value in raw.items()}))
+        return jobs
+
+
+class MemoryJobStore:
+    """In-process job status store with the same interface as JobStore"""
+
+    def __init__(self):
+        self._jobs: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def create(self, job_id: str, fields: Dict[str, Any]):
+        with self._lock:
+            self._jobs[job_id] = dict(fields)
+
+    def exists(self, job_id: str) -> bool:
+        return job_id in self._jobs
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return dict(job) if job is not None else None
+
+    def get_field(self, job_id: str, field: str, default: Any = None) -> Any:
+        return self._jobs.get(job_id, {}).get(field, default)
+
+    def get_fields(self, job_id: str, *fields: str) -> List[Any]:
+        job = self._jobs.get(job_id, {})
+        return [job.get(field) for field in fields]
+
+    def update(self, job_id: str, **fields):
+        with self._lock:
+            self._jobs.setdefault(job_id, {}).update(fields)
+
+    def incr(self, job_id: str, field: str, amount: int = 1) -> int:
+        with self._lock:
+            job = self._jobs.setdefault(job_id, {})
+            job[field] = job.get(field, 0) + amount
+            return job[field]
+
+    def list_jobs(self) -> List[Tuple[str, Dict[str, Any]]]:
+        with self._lock:
+            return [(job_id, dict(job)) for job_id, job in self._jobs.items()]
+
+
+def create_job_store():
+    """Create a Redis-backed store if REDIS_URL is set, otherwise an in-memory one"""
+    client = get_redis()
+    if client is None:
+        return MemoryJobStore()
+    return JobStore(client)
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Async token-bucket rate limiter
+
+Permits are refilled lazily from a monotonic clock whenever a caller asks for
+one, so no background task is needed and slow responses naturally leave
+headroom for later requests instead of being followed by a fixed sleep.
+
+The bucket can also follow the server's own limits: feed each response's
+headers to update_from_headers() and a Retry-After, an exhausted
+X-RateLimit-Remaining or a smaller X-RateLimit-Limit will hold back or
+shrink the bursts that follow.
+"""
+
+import asyncio
+import time
+from email.utils import parsedate_to_datetime
+from typing import Mapping, Optional
+
+
+def retry_after_seconds(headers: Mapping[str, str]) -> Optional[float]:
+    """
+    Parse a Retry-After header
+
+    Args:
+        headers: Response headers (case-insensitive mapping, e.g. httpx.Headers)
+
+    Returns:
+        Seconds to wait, or None if the header is missing or malformed
+    """
+    value = headers.get('Retry-After')
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    # Retry-After may also be an HTTP date
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class RateLimiter:
+    """Token bucket that allows `requests_per_second` acquisitions on average"""
+
+    def __init__(self, requests_per_second: float):
+        """
+        Initialize the rate limiter
+
+        Args:
+            requests_per_second: Sustained number of permits awarded per second
+        """
+        if requests_per_second <= 0:
+            raise ValueError("requests_per_second must be positive")
+
+        self.rate = requests_per_second
+        # Allow a burst of up to one second's worth of requests (at least one)
+        self.capacity = max(1.0, requests_per_second)
+        self.tokens = self.capacity
+        self.last_update = time.monotonic()
+        self.blocked_until = 0.0
+        self.lock = asyncio.Lock()
+
+    async def acquire(self):
+        """Wait until a permit is available and consume it"""
+        async with self.lock:
+            # Honour any pause requested by the server before handing out permits
+            pause = self.blocked_until - time.monotonic()
+            if pause > 0:
+                await asyncio.sleep(pause)
+
+            now = time.monotonic()
+            elapsed = max(0.0, now - self.last_update)
+            self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
+            self.last_update = now
+
+            if self.tokens < 1:
+                # Holding the lock while sleeping keeps waiters in FIFO order
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+                self.tokens = 0.0
+                self.last_update = time.monotonic()
+            else:
+                self.tokens -= 1
+
+    async def __aenter__(self):
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        return False
+
+    def pause(self, seconds: float):
+        """Hand out no permits for the next `seconds` and drop any saved-up burst"""
+        self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
+        self.tokens = 0.0
+        # Refill restarts once the pause is over, so it doesn't end in a full burst
+        self.last_update = max(self.last_update, self.blocked_until)
+
+    def update_from_headers(self, headers: Mapping[str, str]):
+        """
+        Adapt to rate-limit headers from a response
+
+        Args:
+            headers: Response headers (case-insensitive mapping, e.g. httpx.Headers)
+        """
+        retry_after = retry_after_seconds(headers)
+        if retry_after is not None:
+            self.pause(retry_after)
+
+        limit = headers.get('X-RateLimit-Limit')
+        if limit is not None:
+            try:
+                # Never burst past what the server says it allows
+                self.capacity = max(1.0, min(self.capacity, float(limit)))
+                self.tokens = min(self.tokens, self.capacity)
+            except ValueError:
+                pass
+
+        remaining = headers.get('X-RateLimit-Remaining')
+        reset = headers.get('X-RateLimit-Reset')
+        if remaining is not None and reset is not None:
+            try:
+                if float(remaining) <= 0:
+                    reset = float(reset)
+                    # Reset is either an epoch timestamp or a number of seconds
+                    self.pause(reset - time.time() if reset > 1e9 else reset)
+            except ValueError:
+                pass
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Persistent record of scraped URLs, used to resume interrupted CLI runs
+
+Every finished URL is recorded in a small SQLite table as soon as its result
+is written, so rerunning the same job with the same cache skips the URLs that
+already succeeded and only retries the rest. Lookups go through an in-memory
+set of 64-bit xxhash digests first; SQLite is only consulted to confirm a hit,
+so the common "not done yet" case never touches the database.
+"""
+
+import sqlite3
+import time
+from typing import Iterable, Iterator
+
+import xxhash
+
+
+def _digest(url: str) -> int:
+    """64-bit xxhash of a URL (xxhash only hashes bytes)"""
+    return xxhash.xxh64_intdigest(url.encode())
+
+
+class ResumeCache:
+    """SQLite-backed set of URLs that have already been scraped successfully"""
+
+    def __init__(self, path: str):
+        """
+        Open (or create) the cache
+
+        Args:
+            path: Path to the SQLite database file
+        """
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        # WAL with synchronous=NORMAL keeps per-URL commits cheap without risking corruption
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.execute('CREATE TABLE IF NOT EXISTS done(url TEXT PRIMARY KEY, ok INT, ts REAL)')
+        self.conn.commit()
+
+        self._hashes = {
+            _digest(url)
+            for (url,) in self.conn.execute('SELECT url FROM done WHERE ok = 1')
+        }
+        self.skipped = 0
+
+    def __len__(self) -> int:
+        return len(self._hashes)
+
+    def is_done(self, url: str) -> bool:
+        """Check whether a URL was already scraped successfully"""
+        if _digest(url) not in self._hashes:
+            return False
+        # Possible hit; confirm against the database in case of a hash collision
+        row = self.conn.execute('SELECT 1 FROM done WHERE url = ? AND ok = 1', (url,)).fetchone()
+        return row is not None
+
+    def failed(self) -> set:
+        """Return the URLs whose last recorded attempt failed"""
+        return {url for (url,) in self.conn.execute('SELECT url FROM done WHERE ok = 0')}
+
+    def pending(self, urls: Iterable[str]) -> Iterator[str]:
+        """Yield the URLs that still need scraping, counting the rest in self.skipped"""
+        for url in urls:
+            if self.is_done(url):
+                self.skipped += 1
+            else:
+                yield url
+
+    def mark(self, url: str, ok: bool):
+        """Record a finished URL; failures are kept but will be retried on the next run"""
+        self.conn.execute('INSERT OR REPLACE INTO done(url, ok, ts) VALUES (?, ?, ?)',
+                          (url, int(ok), time.time()))
+        self.conn.commit()
+        if ok:
+            self._hashes.add(_digest(url))
+
+    def close(self):
+        """Close the database"""
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Retrying httpx transports
+
+Retries happen below the client, on the same pooled keep-alive connections,
+so callers see a single request that either eventually succeeds or returns
+its last response. Connection errors and responses with a retryable status
+(429 and the usual 5xx gateway errors) are retried with exponential backoff,
+and a Retry-After header, when present, is waited out instead.
+
+An async request can carry a RateLimiter in its `rate_limiter` extension
+(`client.post(..., extensions={'rate_limiter': limiter})`). Retries of that
+request then pause the limiter, so every request sharing it backs off, and
+take a fresh permit from it before being resent.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Iterable, Optional
+
+import httpx
+
+from rate_limiter import retry_after_seconds
+
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+class _RetryPolicy:
+    """Retry settings and backoff schedule shared by the sync and async transports"""
+
+    def __init__(self, max_retries: int = 3, backoff_factor: float = 1.0,
+                 status_forcelist: Iterable[int] = RETRY_STATUSES, max_backoff: float = 120.0,
+                 logger: Optional[logging.Logger] = None):
+        """
+        Args:
+            max_retries: Retries per request after the first attempt
+            backoff_factor: Wait backoff_factor * 2**attempt seconds between attempts
+            status_forcelist: Response status codes worth retrying
+            max_backoff: Upper bound on the computed backoff (Retry-After is not capped)
+            logger: Where to report retries; defaults to this module's logger, so
+                pass the caller's own logger to have them shown with its output
+        """
+        self.max_retries = max(0, max_retries)
+        self.backoff_factor = backoff_factor
+        self.status_forcelist = frozenset(status_forcelist)
+        self.max_backoff = max_backoff
+        self.logger = logger or logging.getLogger(__name__)
+
+    def _backoff(self, attempt: int, response: Optional[httpx.Response] = None) -> float:
+        """Seconds to wait before the next attempt"""
+        if response is not None:
+            retry_after = retry_after_seconds(response.headers)
+            if retry_after is not None:
+                return retry_after
+        return min(self.max_backoff, self.backoff_factor * 2 ** attempt)
+
+    def _should_retry(self, attempt: int, response: httpx.Response) -> bool:
+        return attempt < self.max_retries and response.status_code in self.status_forcelist
+
+
+class RetryTransport(_RetryPolicy, httpx.BaseTransport):
+    """Transport for httpx.Client that retries failed requests"""
+
+    def __init__(self, transport: Optional[httpx.BaseTransport] = None, **kwargs):
+        """
+        Args:
+            transport: Transport that sends the requests (a plain HTTPTransport by default)
+            **kwargs: Retry settings, see _RetryPolicy
+        """
+        super().__init__(**kwargs)
+        self._transport = transport or httpx.HTTPTransport()
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        for attempt in range(self.max_retries + 1):
+            try:
+                response = self._transport.handle_request(request)
+            except httpx.TransportError as e:
+                if attempt == self.max_retries:
+                    raise
+                wait = self._backoff(attempt)
+                self.logger.info("%s %s failed (%s), retrying in %.1fs...", request.method, request.url, e, wait)
+                time.sleep(wait)
+                continue
+
+            if not self._should_retry(attempt, response):
+                return response
+            wait = self._backoff(attempt, response)
+            self.logger.info("%s %s returned %d, retrying in %.1fs...",
+                             request.method, request.url, response.status_code, wait)
+            response.close()
+            time.sleep(wait)
+
+    def close(self):
+        self._transport.close()
+
+
+class AsyncRetryTransport(_RetryPolicy, httpx.AsyncBaseTransport):
+    """Transport for httpx.AsyncClient that retries failed requests"""
+
+    def __init__(self, transport: Optional[httpx.AsyncBaseTransport] = None, **kwargs):
+        """
+        Args:
+            transport: Transport that sends the requests (a plain AsyncHTTPTransport by default)
+            **kwargs: Retry settings, see _RetryPolicy
+        """
+        super().__init__(**kwargs)
+        self._transport = transport or httpx.AsyncHTTPTransport()
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        limiter = request.extensions.get('rate_limiter')
+        for attempt in range(self.max_retries + 1):
+            try:
+                response = await self._transport.handle_async_request(request)
+            except httpx.TransportError as e:
+                if attempt == self.max_retries:
+                    raise
+                wait = self._backoff(attempt)
+                self.logger.info("%s %s failed (%s), retrying in %.1fs...", request.method, request.url, e, wait)
+                await self._wait(wait, limiter)
+                continue
+
+            if not self._should_retry(attempt, response):
+                return response
+            wait = self._backoff(attempt, response)
+            self.logger.info("%s %s returned %d, retrying in %.1fs...",
+                             request.method, request.url, response.status_code, wait)
+            if limiter is not None:
+                limiter.update_from_headers(response.headers)
+            await response.aclose()
+            await self._wait(wait, limiter)
+
+    @staticmethod
+    async def _wait(seconds: float, limiter=None):
+        """Sleep before a retry, or pause the shared limiter and queue for a permit"""
+        if limiter is None:
+            await asyncio.sleep(seconds)
+        else:
+            limiter.pause(seconds)
+            await limiter.acquire()
+
+    async def aclose(self):
+        await self._transport.aclose()
@@ -18,6 +18,12 @@ def test_imports():
         required_files = [
             'app.py',
             'firecrawl_csv_scraper.py',
+            'rate_limiter.py',
+            'resume_cache.py',
+            'retry_transport.py',
+            'job_store.py',
+            'job_queue.py',
+            'worker.py',
             'requirements.txt',
             'templates/base.html',
             'templates/index.html',
@@ -0,0 +1,316 @@
+#!/usr/bin/env python3
+"""
+Tests for the scraper module's CSV input and result output
+
+Run with: python -m unittest test_firecrawl_csv_scraper
+"""
+
+import asyncio
+import csv
+import json
+import os
+import signal
+import tempfile
+import unittest
+from unittest import mock
+
+import firecrawl_csv_scraper as scraper_module
+from firecrawl_csv_scraper import (FirecrawlCSVScraper, ResultSink, ScrapeResult, _drop_records, _iter_column_arrow,
+                                   _iter_column_csv)
+
+
+class CsvColumnTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, 'urls.csv')
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def write(self, text: str, encoding: str = 'utf-8'):
+        with open(self.path, 'w', newline='', encoding=encoding) as f:
+            f.write(text)
+
+    def read_csv(self):
+        with open(self.path, newline='', encoding='utf-8-sig') as f:
+            return list(_iter_column_csv(csv.DictReader(f), 'url'))
+
+    def assertParity(self, expected):
+        self.assertEqual(self.read_csv(), expected)
+        if scraper_module.pacsv is not None:
+            self.assertEqual(list(_iter_column_arrow(self.path, 'url')), expected)
+
+    def test_strips_and_skips_empty_values(self):
+        self.write('name,url\na, https://a.example \nb,\nc,"  "\nd,https://d.example\n')
+        self.assertParity(['https://a.example', 'https://d.example'])
+
+    def test_header_only(self):
+        self.write('name,url')
+        self.assertParity([])
+        self.write('name,url\n')
+        self.assertParity([])
+
+    def test_byte_order_mark(self):
+        self.write('url,name\nhttps://a.example,a\n', encoding='utf-8-sig')
+        self.assertParity(['https://a.example'])
+
+    def test_quoted_newlines(self):
+        self.write('note,url\n"line one\nline two",https://a.example\n"x,\ny",https://b.example\n')
+        self.assertParity(['https://a.example', 'https://b.example'])
+
+    def test_ragged_rows_keep_file_order(self):
+        self.write('url,name\n'
+                   'https://a.example,a\n'
+                   'https://b.example\n'  # Too few cells
+                   'https://c.example,c,extra\n'  # Too many cells
+                   'https://d.example,d\n')
+        self.assertParity(['https://a.example', 'https://b.example', 'https://c.example', 'https://d.example'])
+
+    def test_ragged_row_after_first_batch(self):
+        rows = [f'https://example.com/{i},{"x" * 50}' for i in range(40000)]  # Several pyarrow blocks
+        rows[30000] = 'https://example.com/ragged'
+        self.write('url,name\n' + '\n'.join(rows) + '\n')
+        self.assertParity([row.split(',')[0] for row in rows])
+
+
+class ReplaceRecordsTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def write_run(self, output_file, results, **kwargs):
+        with ResultSink(output_file, **kwargs) as sink:
+            for url, success in results:
+                sink.write(ScrapeResult(url=url, success=success, error=None if success else 'boom'))
+        return sink
+
+    def read_records(self, output_file):
+        with open(output_file, newline='', encoding='utf-8') as f:
+            if output_file.endswith('.jsonl'):
+                return [(record['url'], record['success']) for record in map(json.loads, f)]
+            return [(row['url'], row['success'] == 'True') for row in csv.DictReader(f)]
+
+    def test_resumed_run_replaces_failed_records(self):
+        for suffix in ('.jsonl', '.csv'):
+            with self.subTest(suffix=suffix):
+                output_file = os.path.join(self.tmpdir.name, f'results{suffix}')
+                self.write_run(output_file, [('https://a.example', True), ('https://b.example', False),
+                                             ('https://c.example', False)])
+
+                sink = self.write_run(output_file, [('https://b.example', True), ('https://c.example', False)],
+                                      append=True, replace_urls=['https://b.example', 'https://c.example'])
+                self.assertEqual(sink.removed, 2)
+                self.assertEqual(self.read_records(output_file), [
+                    ('https://a.example', True), ('https://b.example', True), ('https://c.example', False)
+                ])
+
+    def test_replace_urls_ignored_without_append(self):
+        output_file = os.path.join(self.tmpdir.name, 'results.jsonl')
+        self.write_run(output_file, [('https://a.example', False)])
+        sink = self.write_run(output_file, [('https://b.example', True)], replace_urls=['https://a.example'])
+        self.assertEqual(sink.removed, 0)
+        self.assertEqual(self.read_records(output_file), [('https://b.example', True)])
+
+    def test_drop_records_jsonl(self):
+        output_file = os.path.join(self.tmpdir.name, 'results.jsonl')
+        with open(output_file, 'w') as f:
+            f.write('{"url":"https://a.example"}\n\n{"url":"https://b.example"}\n{"url":"https://a.example"}\n')
+        self.assertEqual(_drop_records(output_file, '.jsonl', {'https://a.example'}), 2)
+        with open(output_file) as f:
+            self.assertEqual(f.read(), '\n{"url":"https://b.example"}\n')
+
+    def test_drop_records_csv(self):
+        output_file = os.path.join(self.tmpdir.name, 'results.csv')
+        with open(output_file, 'w', newline='') as f:
+            f.write('success,url\r\nFalse,https://a.example\r\nTrue,"https://b.example"\r\nFalse\r\n')
+        self.assertEqual(_drop_records(output_file, '.csv', {'https://a.example'}), 1)
+        with open(output_file, newline='') as f:
+            self.assertEqual(f.read(), 'success,url\r\nTrue,https://b.example\r\nFalse\r\n')
+
+        empty_file = os.path.join(self.tmpdir.name, 'empty.csv')
+        open(empty_file, 'w').close()
+        self.assertEqual(_drop_records(empty_file, '.csv', {'https://a.example'}), 0)
+        self.assertEqual(os.path.getsize(empty_file), 0)
+
+
+class StubScraper(FirecrawlCSVScraper):
+    """Scraper whose requests finish at once without touching the network"""
+
+    def __init__(self, on_scrape=None):
+        super().__init__(api_key='test', delay=0)
+        self.on_scrape = on_scrape
+
+    async def scrape_url_async(self, url, params, limiter=None):
+        await asyncio.sleep(0)
+        if self.on_scrape is not None:
+            await self.on_scrape(url)
+        return ScrapeResult(url=url, success=True)
+
+
+class ListSink:
+    def __init__(self):
+        self.urls = []
+
+    def write(self, result: ScrapeResult):
+        self.urls.append(result.url)
+
+
+class PipelineTest(unittest.TestCase):
+
+    def setUp(self):
+        self.produced = 0
+
+    def urls(self, n: int):
+        for i in range(n):
+            self.produced += 1
+            yield f'https://example.com/{i}'
+
+    def run_pipeline(self, scraper, urls, concurrency=4, sink=None):
+        async def scrape():
+            async with scraper:
+                return await asyncio.wait_for(
+                    scraper.scrape_urls_batch_async(urls, concurrency=concurrency, sink=sink), timeout=10)
+        return asyncio.run(scrape())
+
+    def test_scrapes_every_url_once(self):
+        # More workers than URLs: every worker still gets its sentinel and exits
+        for n in (0, 3, 50):
+            with self.subTest(n=n):
+                results = self.run_pipeline(StubScraper(), self.urls(n), concurrency=8)
+                self.assertEqual(sorted(r.url for r in results), sorted(self.urls(n)))
+
+    def test_consumes_urls_lazily(self):
+        release = asyncio.Event()
+        produced_while_blocked = []
+
+        async def block(url):
+            if not release.is_set():
+                await asyncio.sleep(0.05)
+                produced_while_blocked.append(self.produced)
+                release.set()
+
+        sink = ListSink()
+        with mock.patch.object(scraper_module, 'PIPELINE_QUEUE_SIZE', 5):
+            self.run_pipeline(StubScraper(block), self.urls(1000), concurrency=2, sink=sink)
+        # Queue, one URL per worker, and the one the producer is waiting to put
+        self.assertLessEqual(produced_while_blocked[0], 5 + 2 + 1)
+        self.assertEqual(len(sink.urls), 1000)
+
+    def test_worker_error_stops_pipeline(self):
+        async def fail(url):
+            if url.endswith('/7'):
+                raise RuntimeError('boom')
+
+        with self.assertRaisesRegex(RuntimeError, 'boom'):
+            self.run_pipeline(StubScraper(fail), self.urls(5000))
+
+    def test_interrupt_finishes_started_urls(self):
+        started = []
+
+        async def interrupt(url):
+            started.append(url)
+            if len(started) == 10:
+                signal.raise_signal(signal.SIGINT)
+            await asyncio.sleep(0.01)
+
+        scraper = StubScraper(interrupt)
+        sink = ListSink()
+        with self.assertLogs(scraper_module.logger, 'WARNING'):
+            self.run_pipeline(scraper, self.urls(5000), sink=sink)
+        self.assertTrue(scraper.interrupted)
+        self.assertEqual(sorted(sink.urls), sorted(started))
+        self.assertLess(len(started), 100)
+        self.assertIs(signal.getsignal(signal.SIGINT), signal.default_int_handler)
+
+    def test_rejects_concurrency_below_one(self):
+        with self.assertRaises(ValueError):
+            self.run_pipeline(StubScraper(), [], concurrency=0)
+
+
+class BatchScrapeTest(unittest.TestCase):
+
+    def setUp(self):
+        self.scraper = FirecrawlCSVScraper(api_key='test', delay=0)
+        self.api = self.scraper.api_url
+
+    def tearDown(self):
+        self.scraper.close()
+
+    def document(self, url, key='sourceURL'):
+        return {'markdown': f'md {url}', 'metadata': {key: url, 'title': url, 'statusCode': 200}}
+
+    def test_results_matched_by_source_url(self):
+        urls = ['https://a.example', 'https://b.example', 'https://c.example', 'https://d.example']
+        data = [self.document(urls[2]), self.document(urls[0]), self.document(urls[1], key='url')]
+        results = self.scraper._batch_results(urls, data, {}, 'now', 0.5)
+
+        self.assertEqual([r.url for r in results], urls)
+        self.assertEqual([r.success for r in results], [True, True, True, False])
+        self.assertEqual([r.content for r in results[:3]], [f'md {url}' for url in urls[:3]])
+        self.assertEqual(results[3].error, 'No result returned by batch scrape')
+        self.assertEqual({r.processing_time for r in results}, {0.5})
+
+    def test_missing_results_use_reported_errors(self):
+        urls = ['https://a.example', 'https://b.example']
+        results = self.scraper._batch_results(urls, [], {'https://b.example': 'Timed out'}, 'now', 0.0)
+        self.assertEqual([r.error for r in results], ['No result returned by batch scrape', 'Timed out'])
+
+    def drive(self, steps, replies):
+        """Run a _batch_steps generator, answering each request with the next reply"""
+        requests = []
+        replies = iter(replies)
+        reply = None
+        while True:
+            try:
+                step = steps.send(reply)
+            except StopIteration as done:
+                return requests, done.value
+            if isinstance(step, float):
+                reply = None
+            else:
+                requests.append(step)
+                reply = next(replies)
+
+    def test_batch_steps_follow_pages_and_fetch_errors(self):
+        urls = ['https://a.example', 'https://b.example', 'https://c.example']
+        status_url = f'{self.api}/v1/batch/scrape/job1'
+        steps = self.scraper._batch_steps(urls, {'formats': ['markdown']}, poll_interval=0, timeout=60)
+        requests, results = self.drive(steps, [
+            {'success': True, 'id': 'job1'},
+            {'status': 'scraping'},
+            {'status': 'completed', 'data': [self.document(urls[0])], 'next': f'{status_url}?skip=1'},
+            {'data': [self.document(urls[2])]},
+            {'errors': [{'url': urls[1], 'error': 'Blocked'}]},
+        ])
+
+        self.assertEqual(requests, [
+            (f'{self.api}/v1/batch/scrape', {'urls': urls, 'formats': ['markdown']}),
+            (status_url, None),
+            (status_url, None),
+            (f'{status_url}?skip=1', None),
+            (f'{status_url}/errors', None),
+        ])
+        self.assertEqual([(r.url, r.success, r.error) for r in results],
+                         [(urls[0], True, None), (urls[1], False, 'Blocked'), (urls[2], True, None)])
+
+    def test_batch_steps_raise_on_failed_job(self):
+        steps = self.scraper._batch_steps(['https://a.example'], {}, poll_interval=0, timeout=60)
+        with self.assertRaisesRegex(RuntimeError, 'quota'):
+            self.drive(steps, [{'success': True, 'id': 'job1'}, {'status': 'failed', 'error': 'quota'}])
+
+        steps = self.scraper._batch_steps(['https://a.example'], {}, poll_interval=0, timeout=60)
+        with self.assertRaisesRegex(RuntimeError, 'Bad key'):
+            self.drive(steps, [{'success': False, 'error': 'Bad key'}])
+
+    def test_batch_steps_time_out(self):
+        steps = self.scraper._batch_steps(['https://a.example'], {}, poll_interval=0, timeout=0)
+        with self.assertRaisesRegex(RuntimeError, 'did not complete'):
+            self.drive(steps, [{'success': True, 'id': 'job1'}, {'status': 'scraping'}])
+
+
+if __name__ == '__main__':
+    unittest.main()
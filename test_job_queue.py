@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Tests for the Redis job queue
+
+Only run when REDIS_URL points at a disposable Redis instance: the tests
+clear the queue's keys.
+
+Run with: python -m unittest test_job_queue
+"""
+
+import os
+import time
+import unittest
+
+from job_store import get_redis
+
+
+@unittest.skipUnless(os.getenv('REDIS_URL'), 'REDIS_URL not set')
+class JobQueueTest(unittest.TestCase):
+
+    def setUp(self):
+        from job_queue import CLAIMED_KEY, INFLIGHT_KEY, PENDING_KEY, JobQueue
+        self.keys = (PENDING_KEY, INFLIGHT_KEY, CLAIMED_KEY)
+        self.queue = JobQueue(get_redis(), visibility_timeout=60)
+        self.queue.redis.delete(*self.keys)
+
+    def tearDown(self):
+        self.queue.redis.delete(*self.keys)
+
+    def test_claim_and_ack(self):
+        self.queue.push({'job_id': 'a'})
+        self.queue.push({'job_id': 'b'})
+
+        raw, payload = self.queue.claim(timeout=1)
+        self.assertEqual(payload, {'job_id': 'a'})
+        self.assertEqual(self.queue.redis.lrange('jobs:inflight', 0, -1), [raw])
+        self.assertIsNotNone(self.queue.redis.hget('jobs:claimed', raw))
+
+        self.queue.ack(raw)
+        self.assertEqual(self.queue.redis.llen('jobs:inflight'), 0)
+        self.assertIsNone(self.queue.redis.hget('jobs:claimed', raw))
+        self.assertEqual(self.queue.claim(timeout=1)[1], {'job_id': 'b'})
+
+    def test_claim_times_out(self):
+        self.assertIsNone(self.queue.claim(timeout=1))
+
+    def test_reclaim_requeues_expired_jobs_first(self):
+        self.queue.push({'job_id': 'stale'})
+        raw, _ = self.queue.claim(timeout=1)
+        self.queue.push({'job_id': 'next'})
+
+        self.assertEqual(self.queue.reclaim(), 0)  # Heartbeat is still fresh
+        self.queue.redis.hset('jobs:claimed', raw, time.time() - 61)
+        self.assertEqual(self.queue.reclaim(), 1)
+
+        self.assertEqual(self.queue.redis.llen('jobs:inflight'), 0)
+        self.assertIsNone(self.queue.redis.hget('jobs:claimed', raw))
+        self.assertEqual(self.queue.claim(timeout=1)[1], {'job_id': 'stale'})
+
+    def test_reclaim_skips_jobs_acked_meanwhile(self):
+        self.queue.push({'job_id': 'a'})
+        raw, _ = self.queue.claim(timeout=1)
+        self.queue.redis.hset('jobs:claimed', raw, time.time() - 61)
+        self.queue.ack(raw)
+
+        self.assertEqual(self.queue.reclaim(), 0)
+        self.assertEqual(self.queue.redis.llen('jobs:pending'), 0)
+
+    def test_reclaim_stamps_unclaimed_heartbeat(self):
+        self.queue.push({'job_id': 'a'})
+        raw = self.queue.redis.rpoplpush('jobs:pending', 'jobs:inflight')  # Worker died before heartbeat
+
+        self.assertEqual(self.queue.reclaim(), 0)
+        self.assertIsNotNone(self.queue.redis.hget('jobs:claimed', raw))
+        self.assertEqual(self.queue.redis.lrange('jobs:inflight', 0, -1), [raw])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Tests for job status storage
+
+The Redis-backed store is only exercised when REDIS_URL points at a
+disposable Redis instance.
+
+Run with: python -m unittest test_job_store
+"""
+
+import os
+import unittest
+import uuid
+from unittest import mock
+
+from job_store import JobStore, MemoryJobStore, create_job_store, get_redis
+
+
+class JobStoreContract:
+    """Behaviour shared by every job store; subclasses provide self.store"""
+
+    def setUp(self):
+        self.job_id = uuid.uuid4().hex
+        self.store.create(self.job_id, {'status': 'queued', 'processed': 0, 'errors': []})
+
+    def test_create_and_get(self):
+        self.assertTrue(self.store.exists(self.job_id))
+        self.assertEqual(self.store.get(self.job_id), {'status': 'queued', 'processed': 0, 'errors': []})
+        self.assertIsNone(self.store.get('missing'))
+        self.assertFalse(self.store.exists('missing'))
+
+    def test_fields(self):
+        self.store.update(self.job_id, status='running', message='Scraping...')
+        self.assertEqual(self.store.get_field(self.job_id, 'status'), 'running')
+        self.assertEqual(self.store.get_field(self.job_id, 'nope', 'default'), 'default')
+        self.assertEqual(self.store.get_fields(self.job_id, 'status', 'message', 'nope'),
+                         ['running', 'Scraping...', None])
+
+    def test_incr(self):
+        self.assertEqual(self.store.incr(self.job_id, 'processed', 5), 5)
+        self.assertEqual(self.store.incr(self.job_id, 'processed'), 6)
+        self.assertEqual(self.store.get_field(self.job_id, 'processed'), 6)
+
+    def test_create_replaces_existing_job(self):
+        self.store.update(self.job_id, message='old')
+        self.store.create(self.job_id, {'status': 'queued'})
+        self.assertEqual(self.store.get(self.job_id), {'status': 'queued'})
+
+    def test_list_jobs(self):
+        jobs = dict(self.store.list_jobs())
+        self.assertEqual(jobs[self.job_id]['status'], 'queued')
+
+
+class MemoryJobStoreTest(JobStoreContract, unittest.TestCase):
+
+    def setUp(self):
+        self.store = MemoryJobStore()
+        super().setUp()
+
+    def test_get_returns_a_copy(self):
+        self.store.get(self.job_id)['status'] = 'changed'
+        self.assertEqual(self.store.get_field(self.job_id, 'status'), 'queued')
+
+    def test_memory_store_without_redis_url(self):
+        with mock.patch.dict(os.environ, {'REDIS_URL': ''}):
+            self.assertIsInstance(create_job_store(), MemoryJobStore)
+
+
+@unittest.skipUnless(os.getenv('REDIS_URL'), 'REDIS_URL not set')
+class RedisJobStoreTest(JobStoreContract, unittest.TestCase):
+
+    def setUp(self):
+        self.store = JobStore(get_redis())
+        super().setUp()
+
+    def tearDown(self):
+        self.store.redis.delete(self.store._key(self.job_id))
+
+
+if __name__ == '__main__':
+    unittest.main()
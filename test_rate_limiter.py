@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Tests for the token-bucket rate limiter
+
+Run with: python -m unittest test_rate_limiter
+"""
+
+import asyncio
+import time
+import unittest
+from email.utils import formatdate
+
+from rate_limiter import RateLimiter, retry_after_seconds
+
+
+async def acquire_times(limiter, count):
+    """Acquire `count` permits and return when each was granted, relative to the start"""
+    start = time.monotonic()
+    times = []
+    for _ in range(count):
+        await limiter.acquire()
+        times.append(time.monotonic() - start)
+    return times
+
+
+class RetryAfterTest(unittest.TestCase):
+
+    def test_seconds(self):
+        self.assertEqual(retry_after_seconds({'Retry-After': '2'}), 2.0)
+        self.assertEqual(retry_after_seconds({'Retry-After': '0'}), 0.0)
+
+    def test_http_date(self):
+        wait = retry_after_seconds({'Retry-After': formatdate(time.time() + 30, usegmt=True)})
+        self.assertAlmostEqual(wait, 30, delta=2)
+
+    def test_missing_or_malformed(self):
+        self.assertIsNone(retry_after_seconds({}))
+        self.assertIsNone(retry_after_seconds({'Retry-After': 'soon'}))
+
+
+class RateLimiterTest(unittest.TestCase):
+
+    def test_rejects_non_positive_rate(self):
+        with self.assertRaises(ValueError):
+            RateLimiter(0)
+
+    def test_burst_then_steady_rate(self):
+        times = asyncio.run(acquire_times(RateLimiter(20), 25))
+        # One second's worth of permits up front, then one every 1/20 s
+        self.assertLess(times[19], 0.05)
+        self.assertGreaterEqual(times[24], 0.2)
+
+    def test_pause_drops_saved_up_burst(self):
+        async def run():
+            limiter = RateLimiter(20)
+            await asyncio.sleep(0.1)  # Bucket is full
+            limiter.update_from_headers({'Retry-After': '0.2'})
+            return await acquire_times(limiter, 4)
+
+        times = asyncio.run(run())
+        self.assertGreaterEqual(times[0], 0.2)
+        # Permits after the pause are paced, not handed out as a burst
+        for earlier, later in zip(times, times[1:]):
+            self.assertGreaterEqual(later - earlier, 0.04)
+
+    def test_rate_limit_headers_cap_burst(self):
+        async def run():
+            limiter = RateLimiter(50)
+            limiter.update_from_headers({'X-RateLimit-Limit': '5'})
+            return limiter.capacity, await acquire_times(limiter, 6)
+
+        capacity, times = asyncio.run(run())
+        self.assertEqual(capacity, 5)
+        self.assertGreaterEqual(times[5], 0.015)
+
+    def test_exhausted_quota_pauses(self):
+        async def run():
+            limiter = RateLimiter(50)
+            limiter.update_from_headers({'X-RateLimit-Remaining': '0', 'X-RateLimit-Reset': '0.2'})
+            return await acquire_times(limiter, 1)
+
+        self.assertGreaterEqual(asyncio.run(run())[0], 0.2)
+
+
+if __name__ == '__main__':
+    unittest.main()
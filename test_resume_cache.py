@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Tests for the --resume SQLite cache
+
+Run with: python -m unittest test_resume_cache
+"""
+
+import os
+import tempfile
+import unittest
+
+from resume_cache import ResumeCache
+
+
+class ResumeCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, 'resume.db')
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_marks_survive_reopening(self):
+        with ResumeCache(self.path) as cache:
+            cache.mark('https://a.example', True)
+            cache.mark('https://b.example', False)
+
+        with ResumeCache(self.path) as cache:
+            self.assertEqual(len(cache), 1)
+            self.assertTrue(cache.is_done('https://a.example'))
+            self.assertFalse(cache.is_done('https://b.example'))
+            self.assertEqual(cache.failed(), {'https://b.example'})
+
+    def test_pending_skips_successes_and_retries_failures(self):
+        with ResumeCache(self.path) as cache:
+            cache.mark('https://a.example', True)
+            cache.mark('https://b.example', False)
+            urls = ['https://a.example', 'https://b.example', 'https://c.example']
+
+            self.assertEqual(list(cache.pending(urls)), ['https://b.example', 'https://c.example'])
+            self.assertEqual(cache.skipped, 1)
+
+    def test_later_success_replaces_failure(self):
+        with ResumeCache(self.path) as cache:
+            cache.mark('https://a.example', False)
+            cache.mark('https://a.example', True)
+
+            self.assertTrue(cache.is_done('https://a.example'))
+            self.assertEqual(cache.failed(), set())
+
+
+if __name__ == '__main__':
+    unittest.main()
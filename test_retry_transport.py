@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Tests for the retrying httpx transports
+
+Run with: python -m unittest test_retry_transport
+"""
+
+import asyncio
+import logging
+import time
+import unittest
+
+import httpx
+
+from rate_limiter import RateLimiter
+from retry_transport import AsyncRetryTransport, RetryTransport
+
+
+def responder(statuses, headers=None):
+    """MockTransport handler returning `statuses` in turn; records each request"""
+    calls = []
+
+    def handle(request):
+        calls.append(request)
+        status = statuses[min(len(calls), len(statuses)) - 1]
+        return httpx.Response(status, headers=headers or {}, json={'attempt': len(calls)})
+
+    return handle, calls
+
+
+class RetryTransportTest(unittest.TestCase):
+
+    def client(self, handler, **kwargs):
+        kwargs.setdefault('backoff_factor', 0)
+        return httpx.Client(transport=RetryTransport(httpx.MockTransport(handler), **kwargs))
+
+    def test_retries_retryable_status_until_success(self):
+        handler, calls = responder([503, 429, 200])
+        with self.client(handler) as client:
+            response = client.post('https://api.example/v1/scrape', json={'url': 'https://a.example'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(calls), 3)
+        # The POST body is resent on every attempt
+        self.assertEqual({call.content for call in calls}, {b'{"url":"https://a.example"}'})
+
+    def test_returns_last_response_when_retries_run_out(self):
+        handler, calls = responder([500])
+        with self.client(handler, max_retries=2) as client:
+            response = client.get('https://api.example/')
+        self.assertEqual(response.status_code, 500)
+        self.assertEqual(len(calls), 3)
+
+    def test_does_not_retry_other_statuses(self):
+        handler, calls = responder([400, 200])
+        with self.client(handler) as client:
+            self.assertEqual(client.get('https://api.example/').status_code, 400)
+        self.assertEqual(len(calls), 1)
+
+    def test_retries_transport_errors(self):
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            if len(calls) == 1:
+                raise httpx.ConnectError('connection refused', request=request)
+            return httpx.Response(200)
+
+        with self.client(handler) as client:
+            self.assertEqual(client.get('https://api.example/').status_code, 200)
+        self.assertEqual(len(calls), 2)
+
+    def test_reraises_transport_error_when_retries_run_out(self):
+        def handler(request):
+            raise httpx.ConnectError('connection refused', request=request)
+
+        with self.client(handler, max_retries=1) as client:
+            with self.assertRaises(httpx.ConnectError):
+                client.get('https://api.example/')
+
+    def test_backoff_honours_retry_after(self):
+        transport = RetryTransport(httpx.MockTransport(lambda request: httpx.Response(200)), backoff_factor=1.0)
+        self.assertEqual(transport._backoff(3), 8.0)
+        self.assertEqual(transport._backoff(3, httpx.Response(429, headers={'Retry-After': '0.5'})), 0.5)
+
+    def test_logs_retries_to_given_logger(self):
+        handler, _ = responder([502, 200])
+        with self.assertLogs('firecrawl_csv_scraper', logging.INFO) as logs:
+            with self.client(handler, logger=logging.getLogger('firecrawl_csv_scraper')) as client:
+                client.get('https://api.example/')
+        self.assertIn('returned 502', logs.output[0])
+
+
+class AsyncRetryTransportTest(unittest.TestCase):
+
+    def test_retries_retryable_status_until_success(self):
+        handler, calls = responder([429, 200], headers={'Retry-After': '0'})
+
+        async def run():
+            transport = AsyncRetryTransport(httpx.MockTransport(handler), backoff_factor=0)
+            async with httpx.AsyncClient(transport=transport) as client:
+                return await client.post('https://api.example/v1/scrape', json={'url': 'https://a.example'})
+
+        response = asyncio.run(run())
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {'attempt': 2})
+        self.assertEqual(len(calls), 2)
+
+    def test_retries_pause_and_take_permits_from_rate_limiter(self):
+        handler, calls = responder([429, 200], headers={'Retry-After': '0.2'})
+
+        async def run():
+            limiter = RateLimiter(requests_per_second=1000)
+            transport = AsyncRetryTransport(httpx.MockTransport(handler), backoff_factor=0)
+            async with httpx.AsyncClient(transport=transport) as client:
+                start = time.monotonic()
+                response = await client.get('https://api.example/', extensions={'rate_limiter': limiter})
+                return response, limiter, time.monotonic() - start, start
+
+        response, limiter, elapsed, start = asyncio.run(run())
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(calls), 2)
+        # The 429 paused the shared limiter, not just this request
+        self.assertGreaterEqual(limiter.blocked_until - start, 0.2)
+        self.assertGreaterEqual(elapsed, 0.2)
+        # ...and the retry consumed a permit after the pause
+        self.assertLess(limiter.tokens, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Firecrawl CSV Scraper background worker
+
+Consumes scraping jobs queued by the web application (see job_queue.py) and
+runs them. Requires REDIS_URL, and the uploads/results folders must be on
+storage shared with the web process.
+
+Usage:
+    python worker.py
+"""
+
+import os
+import sys
+import threading
+import time
+
+from app import job_status, run_scraping_job
+from job_queue import create_job_queue
+
+HEARTBEAT_INTERVAL = 30  # seconds
+RECLAIM_INTERVAL = 60  # seconds
+
+
+def heartbeat_loop(queue, raw, done: threading.Event):
+    """Keep a claimed job's heartbeat fresh until it finishes"""
+    while not done.wait(HEARTBEAT_INTERVAL):
+        queue.heartbeat(raw)
+
+
+def reclaim_loop(queue):
+    """Periodically requeue jobs abandoned by dead workers"""
+    while True:
+        try:
+            reclaimed = queue.reclaim()
+            if reclaimed:
+                print(f"♻️  Requeued {reclaimed} abandoned job(s)")
+        except Exception as e:
+            print(f"Error reclaiming jobs: {e}")
+        time.sleep(RECLAIM_INTERVAL)
+
+
+def worker_loop(queue):
+    """Claim and run jobs forever"""
+    while True:
+        claimed = queue.claim()
+        if claimed is None:
+            continue
+        raw, payload = claimed
+        job_id = payload['job_id']
+
+        if job_status.get_field(job_id, 'status') == 'cancelled':
+            print(f"🛑 Skipping cancelled job {job_id}")
+            queue.ack(raw)
+            continue
+
+        print(f"▶️  Starting job {job_id}")
+        done = threading.Event()
+        heartbeat = threading.Thread(target=heartbeat_loop, args=(queue, raw, done), daemon=True)
+        heartbeat.start()
+        try:
+            run_scraping_job(**payload)
+        finally:
+            done.set()
+            queue.ack(raw)
+        print(f"⏹️  Finished job {job_id}")
+
+
+def main():
+    """Start the reclaimer and a pool of worker threads"""
+    queue = create_job_queue()
+    if queue is None:
+        print("Error: REDIS_URL must be set to run the worker")
+        sys.exit(1)
+
+    concurrency = int(os.getenv('WORKER_CONCURRENCY', 2))
+    print(f"Starting {concurrency} worker thread(s)...")
+
+    threading.Thread(target=reclaim_loop, args=(queue,), daemon=True).start()
+
+    workers = [threading.Thread(target=worker_loop, args=(queue,), daemon=True) for _ in range(concurrency)]
+    for worker in workers:
+        worker.start()
+
+    try:
+        for worker in workers:
+            worker.join()
+    except KeyboardInterrupt:
+        print("\nWorker stopped by user")
+
+
+if __name__ == "__main__":
+    main()